@@ -4,14 +4,16 @@ Hedging Grid Robot - Bitget API Client
 REST API va order management
 """
 
-import hmac
 import hashlib
-import base64
+import re
+import random
 import time
 import json
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import uuid
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable, AsyncIterator
+from binascii import b2a_base64
 from dataclasses import dataclass
 from urllib.parse import urlencode
 
@@ -21,6 +23,108 @@ from .config import APIConfig
 
 logger = logging.getLogger(__name__)
 
+# JSON - orjson bo'lsa tezroq (bytes qaytaradi), bo'lmasa stdlib json
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode('utf-8')
+
+    _json_loads = json.loads
+
+# Connection pool sozlamalari
+CONNECTOR_LIMIT_PER_HOST = 32
+CONNECTOR_DNS_TTL = 300        # DNS cache (soniya)
+CONNECTOR_KEEPALIVE = 75       # Keep-alive timeout (soniya)
+
+# Xato xabarlarini klassifikatsiya qilish (bitta o'tishda, lower() siz)
+_AUTH_ERROR_RE = re.compile(r"signature|auth", re.IGNORECASE)
+_RATE_ERROR_RE = re.compile(r"rate|limit", re.IGNORECASE)
+
+def _sha_acceleration_info() -> str:
+    """CPU SHA extension (sha_ni / ARM sha2) bor-yo'qligini aniqlash (diagnostika)"""
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+    except OSError:
+        return "noma'lum"
+    if " sha_ni" in flags:
+        return "sha_ni"
+    if " sha2" in flags:
+        return "arm-sha2"
+    return "yo'q (software SHA-256)"
+
+
+_sha_logged = False
+
+
+def _backoff_delay(attempt: int) -> float:
+    """
+    Jitter bilan exponential backoff
+
+    O'rtacha 2**attempt, lekin ±50% tasodifiy - bir vaqtda xato olgan
+    so'rovlar bir vaqtda qayta urinmasligi uchun.
+    """
+    base = 2 ** attempt
+    return random.uniform(base * 0.5, base * 1.5)
+
+
+# HTTP method -> imzo uchun bytes (upper() va encode() siz)
+_METHOD_BYTES = {"GET": b"GET", "POST": b"POST", "DELETE": b"DELETE"}
+
+# Query string cache hajmi (params to'plami bo'yicha)
+QUERY_CACHE_SIZE = 256
+
+# Order batching sozlamalari
+ORDER_BATCH_MAX = 20           # Bitget batch endpoint limiti
+
+# WebSocket - Bitget 30 soniya ichida "ping" kelmasa ulanishni uzadi
+WS_PING_INTERVAL = 25.0
+
+# Umumiy connectorlar - (event loop, BASE_URL, DEMO_MODE) bo'yicha
+# Bir nechta BitgetClient (server rejimida har bir user uchun) bitta pool ishlatadi.
+# Connector o'zi yaratilgan loop ga bog'liq - boshqa loop uni qayta ishlatmaydi
+_shared_connectors: Dict[Tuple[asyncio.AbstractEventLoop, str, bool], aiohttp.TCPConnector] = {}
+
+
+def _get_shared_connector(base_url: str, demo_mode: bool) -> aiohttp.TCPConnector:
+    """Umumiy TCP connector olish (kerak bo'lsa yaratish)"""
+    loop = asyncio.get_running_loop()
+    key = (loop, base_url, demo_mode)
+    connector = _shared_connectors.get(key)
+    if connector is None or connector.closed:
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+            ttl_dns_cache=CONNECTOR_DNS_TTL,
+            keepalive_timeout=CONNECTOR_KEEPALIVE,
+            enable_cleanup_closed=True
+        )
+        # Yopilgan loop lardan qolgan yozuvlar (masalan, oldingi asyncio.run)
+        for stale in [k for k in _shared_connectors if k[0].is_closed()]:
+            del _shared_connectors[stale]
+        _shared_connectors[key] = connector
+    return connector
+
+
+async def close_shared_connectors():
+    """
+    Joriy loop dagi umumiy connectorlarni yopish
+
+    Jarayon to'xtashida chaqiriladi (server lifespan, run.py) - aks holda
+    "Unclosed connector" ogohlantirishi chiqadi.
+    """
+    loop = asyncio.get_running_loop()
+    for key in [k for k in _shared_connectors if k[0] is loop]:
+        connector = _shared_connectors.pop(key)
+        if not connector.closed:
+            await connector.close()
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #                               EXCEPTIONS
@@ -49,7 +153,7 @@ class BitgetRateLimitError(BitgetAPIError):
 #                               DATA CLASSES
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position:
     """Pozitsiya ma'lumotlari"""
     symbol: str
@@ -63,7 +167,7 @@ class Position:
     margin_mode: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Order:
     """Order ma'lumotlari"""
     order_id: str
@@ -78,6 +182,90 @@ class Order:
     create_time: int
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#                               ORDER BATCHING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class _BatchQueue:
+    """
+    Bir vaqtda kelgan order so'rovlarini bitta requestga yig'ish
+
+    Har bir (endpoint, symbol, ...) uchun alohida navbat. Worker birinchi
+    so'rovni kutadi, keyin navbatda turganlarini kutmasdan (get_nowait)
+    yig'ib, flush funksiyasiga beradi. gather qilingan BUY/SELL submitlar
+    worker ishlashidan oldin put() qiladi (cheksiz navbat - put kutmaydi),
+    shuning uchun yolg'iz order ortiqcha kechikish to'lamaydi. Navbat
+    tartibi saqlanadi.
+    """
+
+    def __init__(self, flush: Callable[[List[Dict]], Awaitable[List[Any]]]):
+        """
+        Args:
+            flush: Payloadlar ro'yxatini yuborib, har biri uchun natija
+                   (yoki exception obyekti) qaytaruvchi funksiya
+        """
+        self._flush = flush
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, payload: Dict) -> Any:
+        """So'rovni navbatga qo'yish va natijani kutish"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((payload, future))
+        return await future
+
+    async def _run(self):
+        """Navbatdan batchlarni yig'ib yuborish"""
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            # Bitta loop aylanishi - shu tickda submit qilinganlar ham navbatga tushadi
+            await asyncio.sleep(0)
+            while len(batch) < ORDER_BATCH_MAX and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            try:
+                results = await self._flush([payload for payload, _ in batch])
+            except asyncio.CancelledError:
+                self._fail(batch, BitgetAPIError("CLOSED", "Client yopildi"))
+                raise
+            except Exception as e:
+                self._fail(batch, e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    @staticmethod
+    def _fail(batch: List[Tuple[Dict, asyncio.Future]], error: BaseException):
+        """Batch dagi barcha kutayotganlarga xato berish"""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self):
+        """Workerni to'xtatish, navbatdagi so'rovlarni bekor qilish"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._fail(pending, BitgetAPIError("CLOSED", "Client yopildi"))
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #                               BITGET CLIENT
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -89,30 +277,109 @@ class BitgetClient:
     REST API orqali trading operatsiyalari
     """
 
-    def __init__(self, config: APIConfig):
+    def __init__(self, config: APIConfig,
+                 session: Optional[aiohttp.ClientSession] = None):
         """
         Args:
             config: API konfiguratsiyasi
+            session: Tashqaridan berilgan session (ixtiyoriy) - close() uni yopmaydi
         """
         self.config = config
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session: bool = session is None
+        # Order batching navbatlari - (endpoint, symbol, product_type, margin_coin)
+        self._batch_queues: Dict[Tuple[str, ...], _BatchQueue] = {}
+        # Imzo kalitlari bir marta encode qilinadi (har requestda emas)
+        self._secret_bytes = config.SECRET_KEY.encode('utf-8')
+        self._api_key_bytes = config.API_KEY.encode('utf-8')
+
+        # HMAC inner/outer pad holatlari oldindan hisoblanadi - har imzoda
+        # faqat .copy() + message, kalit bloklari qayta hash qilinmaydi
+        key = self._secret_bytes
+        if len(key) > 64:
+            key = hashlib.sha256(key).digest()
+        key = key.ljust(64, b"\0")
+        self._hmac_inner = hashlib.sha256(bytes(b ^ 0x36 for b in key))
+        self._hmac_outer = hashlib.sha256(bytes(b ^ 0x5C for b in key))
+
+        global _sha_logged
+        if not _sha_logged:
+            _sha_logged = True
+            logger.debug(f"HMAC-SHA256: CPU SHA acceleration = {_sha_acceleration_info()}")
+
+        # Ticker cache - (symbol, product_type) -> (monotonic vaqt, ticker)
+        self._ticker_cache: Dict[Tuple[str, str], Tuple[float, Dict]] = {}
+        # Bajarilayotgan ticker so'rovlari - parallel chaqiruvlar bitta requestni kutadi
+        self._ticker_inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+
+        # Encoded query string cache - frozenset(params) -> "path?query"
+        self._qs_cache: Dict[Tuple[str, frozenset], str] = {}
+
+        # Header shabloni - o'zgarmas qismlar bir marta yig'iladi
+        self._header_template: Dict[str, str] = {
+            "ACCESS-KEY": config.API_KEY,
+            "ACCESS-PASSPHRASE": config.PASSPHRASE,
+            "Content-Type": "application/json",
+            "locale": "en-US"
+        }
+        # Demo mode uchun maxsus header
+        if config.DEMO_MODE:
+            self._header_template["paptrading"] = "1"
 
     # ─────────────────────────────────────────────────────────────────────────
     #                           SESSION MANAGEMENT
     # ─────────────────────────────────────────────────────────────────────────
 
     async def _get_session(self) -> aiohttp.ClientSession:
-        """HTTP session olish"""
+        """
+        HTTP session olish
+
+        Connector barcha clientlar uchun umumiy - TCP/TLS ulanishlar
+        va DNS cache requestlar orasida qayta ishlatiladi.
+        """
         if self._session is None or self._session.closed:
+            self._owns_session = True
             timeout = aiohttp.ClientTimeout(total=self.config.TIMEOUT)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            connector = _get_shared_connector(self.config.BASE_URL, self.config.DEMO_MODE)
+            # Cookie, env proxy va User-Agent kerak emas - bu yo'llar o'chiriladi.
+            # Auto-decompress qoladi: candles javoblari gzip bilan ancha kichik
+            self._session = aiohttp.ClientSession(
+                timeout=timeout,
+                connector=connector,
+                connector_owner=False,
+                cookie_jar=aiohttp.DummyCookieJar(),
+                trust_env=False,
+                skip_auto_headers=("User-Agent",),
+                read_bufsize=16384
+            )
         return self._session
 
     async def close(self):
-        """Sessionni yopish"""
-        if self._session and not self._session.closed:
+        """Sessionni yopish (umumiy connector ochiq qoladi)"""
+        for queue in self._batch_queues.values():
+            await queue.close()
+        self._batch_queues.clear()
+
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
 
+    async def __aenter__(self) -> "BitgetClient":
+        """Sessionni oldindan ochish - birinchi so'rov kutmaydi"""
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_batch_queue(self, key: Tuple[str, ...],
+                         flush: Callable[[List[Dict]], Awaitable[List[Any]]]) -> _BatchQueue:
+        """Batch navbatini olish (kerak bo'lsa yaratish)"""
+        queue = self._batch_queues.get(key)
+        if queue is None:
+            queue = _BatchQueue(flush)
+            self._batch_queues[key] = queue
+        return queue
+
     # ─────────────────────────────────────────────────────────────────────────
     #                           AUTHENTICATION
     # ─────────────────────────────────────────────────────────────────────────
@@ -125,33 +392,54 @@ class BitgetClient:
         Bitget imzo formati:
         sign = base64(hmac_sha256(secret, timestamp + method + path + body))
         """
-        message = timestamp + method.upper() + path + body
-        signature = hmac.new(
-            self.config.SECRET_KEY.encode('utf-8'),
-            message.encode('utf-8'),
-            hashlib.sha256
-        )
-        return base64.b64encode(signature.digest()).decode('utf-8')
+        method_bytes = _METHOD_BYTES.get(method) or method.upper().encode('ascii')
+        message = timestamp.encode('ascii') + method_bytes + (path + body).encode('utf-8')
+        return b2a_base64(self._hmac_sha256(message), newline=False).decode('ascii')
+
+    def _hmac_sha256(self, message: bytes) -> bytes:
+        """
+        HMAC-SHA256 (oldindan hisoblangan pad holatlaridan)
+
+        hmac.digest() dan ~2x tez: har chaqiruvda kalitning 2 ta 64-baytli
+        bloki qayta hash qilinmaydi. Bo'laklab update() qilish esa
+        o'lchovda sekinroq chiqdi - message bitta concat bilan beriladi.
+        """
+        inner = self._hmac_inner.copy()
+        inner.update(message)
+        outer = self._hmac_outer.copy()
+        outer.update(inner.digest())
+        return outer.digest()
+
+    def _sign_get(self, timestamp_bytes: bytes, request_path: bytes) -> str:
+        """
+        Body siz GET uchun tezkor imzo (ticker, positions, account)
+
+        message = timestamp + "GET" + path (body bo'sh)
+        """
+        signature = self._hmac_sha256(timestamp_bytes + b"GET" + request_path)
+        return b2a_base64(signature, newline=False).decode('ascii')
 
     def _get_headers(self, method: str, path: str, body: str = "") -> Dict:
         """API headers yaratish"""
-        timestamp = str(int(time.time() * 1000))
-        sign = self._generate_signature(timestamp, method, path, body)
-
-        headers = {
-            "ACCESS-KEY": self.config.API_KEY,
-            "ACCESS-SIGN": sign,
-            "ACCESS-TIMESTAMP": timestamp,
-            "ACCESS-PASSPHRASE": self.config.PASSPHRASE,
-            "Content-Type": "application/json",
-            "locale": "en-US"
-        }
+        headers = self._header_template.copy()
+        self._sign_headers(headers, method, path, body)
+        return headers
 
-        # Demo mode uchun maxsus header
-        if self.config.DEMO_MODE:
-            headers["paptrading"] = "1"
+    def _sign_headers(self, headers: Dict, method: str, path: str, body: str = ""):
+        """
+        Timestamp va imzoni headersga yozish (joyida)
 
-        return headers
+        Retry da faqat shu chaqiriladi - qolgan fieldlar o'zgarmaydi.
+        """
+        timestamp = str(time.time_ns() // 1_000_000)
+
+        if method == "GET" and not body:
+            sign = self._sign_get(timestamp.encode('ascii'), path.encode('utf-8'))
+        else:
+            sign = self._generate_signature(timestamp, method, path, body)
+
+        headers["ACCESS-SIGN"] = sign
+        headers["ACCESS-TIMESTAMP"] = timestamp
 
     # ─────────────────────────────────────────────────────────────────────────
     #                           REQUEST METHODS
@@ -174,65 +462,82 @@ class BitgetClient:
         """
         session = await self._get_session()
 
-        url = self.config.BASE_URL + path
+        # Config qiymatlari bir marta localga olinadi (retry loop ichida ishlatiladi)
+        cfg = self.config
+        max_retries = cfg.MAX_RETRIES
+        last_attempt = max_retries - 1
+
         request_path = path
 
         # Query string qo'shish (SORTED - imzo uchun muhim!)
+        # Bir xil params (symbol, productType) uchun tayyor natija ishlatiladi
         if params:
-            query = urlencode(sorted(params.items()))
-            request_path = f"{path}?{query}"
-            url = f"{url}?{query}"
+            key = (path, frozenset(params.items()))
+            request_path = self._qs_cache.get(key)
+            if request_path is None:
+                request_path = f"{path}?{urlencode(sorted(params.items()))}"
+                if len(self._qs_cache) >= QUERY_CACHE_SIZE:
+                    self._qs_cache.clear()
+                self._qs_cache[key] = request_path
+
+        url = cfg.BASE_URL + request_path
 
-        # Body
-        body_str = json.dumps(body) if body else ""
+        # Body - bytes holida yuboriladi, imzo uchun str
+        body_bytes = _json_dumps(body) if body else b""
+        body_str = body_bytes.decode('utf-8')
 
         # Headers (request_path ishlatiladi, path emas)
         headers = self._get_headers(method, request_path, body_str)
 
         # Request
-        for attempt in range(self.config.MAX_RETRIES):
+        for attempt in range(max_retries):
             try:
                 async with session.request(
                     method=method,
                     url=url,
                     headers=headers,
-                    data=body_str if body else None
+                    data=body_bytes if body else None
                 ) as response:
 
-                    text = await response.text()
+                    # Bytes holida o'qiladi - JSON parser UTF-8 ni o'zi tushunadi
+                    raw = await response.read()
 
                     # Rate limit
                     if response.status == 429:
                         wait_time = int(response.headers.get("Retry-After", 5))
                         logger.warning(f"Rate limit! {wait_time}s kutilmoqda...")
                         await asyncio.sleep(wait_time)
+                        # Headers yangilash (timestamp eskiradi)
+                        self._sign_headers(headers, method, request_path, body_str)
                         continue
 
                     # Cloudflare 5xx xatolar - retry qilish kerak
                     if response.status >= 500:
-                        is_cloudflare = "cloudflare" in text.lower() or "<!DOCTYPE" in text
+                        is_cloudflare = b"cloudflare" in raw.lower() or b"<!DOCTYPE" in raw
                         if is_cloudflare:
-                            wait_time = 2 ** attempt  # Exponential backoff
-                            logger.warning(f"Cloudflare {response.status} xatosi (attempt {attempt + 1}), {wait_time}s kutilmoqda...")
-                            if attempt < self.config.MAX_RETRIES - 1:
+                            wait_time = _backoff_delay(attempt)  # Exponential backoff + jitter
+                            logger.warning(f"Cloudflare {response.status} xatosi (attempt {attempt + 1}), {wait_time:.1f}s kutilmoqda...")
+                            if attempt < last_attempt:
                                 await asyncio.sleep(wait_time)
                                 # Headers yangilash (timestamp eskiradi)
-                                headers = self._get_headers(method, request_path, body_str)
+                                self._sign_headers(headers, method, request_path, body_str)
                                 continue
                             else:
                                 raise BitgetAPIError("CLOUDFLARE_ERROR", f"Cloudflare xatosi: {response.status}")
 
                     # Parse response
                     try:
-                        data = json.loads(text)
-                    except json.JSONDecodeError:
+                        data = _json_loads(raw)
+                    except ValueError:
+                        # Matnga faqat xato bo'lganda o'giriladi
+                        text = raw.decode('utf-8', errors='replace')
                         # HTML javob - bu odatda Cloudflare xatosi
                         if "<!DOCTYPE" in text or "<html" in text.lower():
-                            wait_time = 2 ** attempt
-                            logger.warning(f"HTML javob olindi (Cloudflare?), attempt {attempt + 1}, {wait_time}s kutilmoqda...")
-                            if attempt < self.config.MAX_RETRIES - 1:
+                            wait_time = _backoff_delay(attempt)
+                            logger.warning(f"HTML javob olindi (Cloudflare?), attempt {attempt + 1}, {wait_time:.1f}s kutilmoqda...")
+                            if attempt < last_attempt:
                                 await asyncio.sleep(wait_time)
-                                headers = self._get_headers(method, request_path, body_str)
+                                self._sign_headers(headers, method, request_path, body_str)
                                 continue
                         raise BitgetAPIError("PARSE_ERROR", f"JSON parse error: {text[:500]}")
 
@@ -241,9 +546,9 @@ class BitgetClient:
                         code = data.get("code", "UNKNOWN")
                         msg = data.get("msg", "Unknown error")
 
-                        if "signature" in msg.lower() or "auth" in msg.lower():
+                        if _AUTH_ERROR_RE.search(msg):
                             raise BitgetAuthError(code, msg)
-                        if "rate" in msg.lower() or "limit" in msg.lower():
+                        if _RATE_ERROR_RE.search(msg):
                             raise BitgetRateLimitError(code, msg)
 
                         # N4 fix - Temporary errors uchun retry
@@ -251,10 +556,10 @@ class BitgetClient:
                         # 40034: Request too frequent
                         if code in ("50000", "40034", "40001"):
                             logger.warning(f"Temporary error (attempt {attempt + 1}): [{code}] {msg}")
-                            if attempt < self.config.MAX_RETRIES - 1:
-                                await asyncio.sleep(2 ** attempt)
+                            if attempt < last_attempt:
+                                await asyncio.sleep(_backoff_delay(attempt))
                                 # Headers yangilash (timestamp eskiradi)
-                                headers = self._get_headers(method, request_path, body_str)
+                                self._sign_headers(headers, method, request_path, body_str)
                                 continue
                             # Oxirgi urinishda xatoni tashlash
 
@@ -265,17 +570,18 @@ class BitgetClient:
             except asyncio.TimeoutError:
                 # G3 fix - Timeout xatosini handle qilish
                 logger.warning(f"Request timeout (attempt {attempt + 1}): {url}")
-                if attempt < self.config.MAX_RETRIES - 1:
-                    await asyncio.sleep(2 ** attempt)
+                if attempt < last_attempt:
+                    await asyncio.sleep(_backoff_delay(attempt))
                     # Headers yangilash (timestamp eskiradi)
-                    headers = self._get_headers(method, request_path, body_str)
+                    self._sign_headers(headers, method, request_path, body_str)
                 else:
-                    raise BitgetAPIError("TIMEOUT", f"Request timeout after {self.config.TIMEOUT}s")
+                    raise BitgetAPIError("TIMEOUT", f"Request timeout after {cfg.TIMEOUT}s")
 
             except aiohttp.ClientError as e:
                 logger.error(f"Request error (attempt {attempt + 1}): {e}")
-                if attempt < self.config.MAX_RETRIES - 1:
-                    await asyncio.sleep(2 ** attempt)
+                if attempt < last_attempt:
+                    await asyncio.sleep(_backoff_delay(attempt))
+                    self._sign_headers(headers, method, request_path, body_str)
                 else:
                     raise BitgetAPIError("NETWORK_ERROR", str(e))
 
@@ -330,11 +636,33 @@ class BitgetClient:
 
     async def get_ticker(self, symbol: str,
                          product_type: str = "USDT-FUTURES") -> Dict:
-        """Ticker (narx) olish"""
+        """
+        Ticker (narx) olish
+
+        Natija TICKER_TTL davomida cache'da turadi; bir vaqtda kelgan
+        chaqiruvlar bitta HTTP so'rovni birga kutadi.
+        """
+        key = (symbol, product_type)
+        cached = self._ticker_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.config.TICKER_TTL:
+            return cached[1]
+
+        task = self._ticker_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_ticker(symbol, product_type))
+            self._ticker_inflight[key] = task
+            task.add_done_callback(lambda _: self._ticker_inflight.pop(key, None))
+
+        # shield - bitta chaqiruvchi bekor qilinsa, boshqalar uchun so'rov davom etadi
+        return await asyncio.shield(task)
+
+    async def _fetch_ticker(self, symbol: str, product_type: str) -> Dict:
+        """Tickerni API dan olish va cache'ga yozish"""
         params = {"symbol": symbol, "productType": product_type}
         data = await self.get("/api/v2/mix/market/ticker", params)
         if isinstance(data, list) and len(data) > 0:
-            return data[0]
+            data = data[0]
+        self._ticker_cache[(symbol, product_type)] = (time.monotonic(), data)
         return data
 
     async def get_price(self, symbol: str,
@@ -366,6 +694,49 @@ class BitgetClient:
         }
         return await self.get("/api/v2/mix/market/candles", params)
 
+    async def stream_public(self, channels: List[Dict]) -> AsyncIterator[Dict]:
+        """
+        Public WebSocket kanallariga obuna bo'lib, push xabarlarni berish
+
+        Ulanish uzilganda generator tugaydi - qayta ulanish chaqiruvchida.
+
+        Args:
+            channels: Obuna argumentlari ({"instType", "channel", "instId"})
+
+        Yields:
+            "data" maydoni bor xabarlar (arg, action, data)
+        """
+        session = await self._get_session()
+        async with session.ws_connect(self.config.WS_PUBLIC_URL) as ws:
+            await ws.send_str(_json_dumps({"op": "subscribe", "args": channels}).decode())
+            last_ping = time.monotonic()
+
+            while True:
+                now = time.monotonic()
+                if now - last_ping >= WS_PING_INTERVAL:
+                    await ws.send_str("ping")
+                    last_ping = now
+
+                # Faqat keyingi ping muddatigacha kutish - xabarlar orasidagi
+                # pauza qanday bo'lmasin, ping WS_PING_INTERVAL dan kechikmaydi
+                try:
+                    msg = await ws.receive(
+                        timeout=max(0.0, WS_PING_INTERVAL - (time.monotonic() - last_ping))
+                    )
+                except asyncio.TimeoutError:
+                    continue
+
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    return
+                if msg.data == "pong":
+                    continue
+
+                data = _json_loads(msg.data)
+                if data.get("event") == "error":
+                    raise BitgetAPIError(str(data.get("code", "WS_ERROR")), data.get("msg", ""))
+                if "data" in data:
+                    yield data
+
     # ─────────────────────────────────────────────────────────────────────────
     #                           POSITION METHODS
     # ─────────────────────────────────────────────────────────────────────────
@@ -382,18 +753,22 @@ class BitgetClient:
 
         positions = []
         if data:
+            _float = float
+            append = positions.append
             for item in data:
-                if float(item.get("total", 0)) > 0:
-                    positions.append(Position(
-                        symbol=item.get("symbol", ""),
-                        side=item.get("holdSide", ""),
-                        size=float(item.get("total", 0)),
-                        entry_price=float(item.get("openPriceAvg", 0)),
-                        mark_price=float(item.get("markPrice", 0)),
-                        unrealized_pnl=float(item.get("unrealizedPL", 0)),
-                        liquidation_price=float(item.get("liquidationPrice", 0)),
-                        leverage=int(item.get("leverage", 1)),
-                        margin_mode=item.get("marginMode", "")
+                get = item.get
+                size = _float(get("total", 0))
+                if size > 0:
+                    append(Position(
+                        symbol=get("symbol", ""),
+                        side=get("holdSide", ""),
+                        size=size,
+                        entry_price=_float(get("openPriceAvg", 0)),
+                        mark_price=_float(get("markPrice", 0)),
+                        unrealized_pnl=_float(get("unrealizedPL", 0)),
+                        liquidation_price=_float(get("liquidationPrice", 0)),
+                        leverage=int(get("leverage", 1)),
+                        margin_mode=get("marginMode", "")
                     ))
 
         return positions
@@ -401,11 +776,35 @@ class BitgetClient:
     async def get_position(self, symbol: str, side: str,
                            product_type: str = "USDT-FUTURES") -> Optional[Position]:
         """Bitta pozitsiyani olish"""
-        positions = await self.get_positions(symbol, product_type)
-        for pos in positions:
-            if pos.side == side:
-                return pos
-        return None
+        return (await self.get_position_map(symbol, product_type)).get(side)
+
+    async def get_position_map(self, symbol: str,
+                               product_type: str = "USDT-FUTURES") -> Dict[str, Position]:
+        """
+        Pozitsiyalarni side bo'yicha olish - {'long': Position, 'short': Position}
+
+        Ikkala tomon bitta so'rov bilan olinadi.
+        """
+        return {pos.side: pos for pos in await self.get_positions(symbol, product_type)}
+
+    async def snapshot(self, symbol: str,
+                       product_type: str = "USDT-FUTURES",
+                       margin_coin: str = "USDT") -> Tuple[float, List[Position], float]:
+        """
+        Narx, pozitsiyalar va balansni parallel olish
+
+        Uchala so'rov bir vaqtda yuboriladi (umumiy connector pool orqali),
+        shuning uchun kechikish ~1 RTT bo'ladi, 3 emas.
+
+        Returns:
+            (price, positions, balance)
+        """
+        price, positions, balance = await asyncio.gather(
+            self.get_price(symbol, product_type),
+            self.get_positions(symbol, product_type, margin_coin),
+            self.get_balance(product_type, margin_coin)
+        )
+        return price, positions, balance
 
     # ─────────────────────────────────────────────────────────────────────────
     #                           ORDER METHODS
@@ -457,7 +856,12 @@ class BitgetClient:
         if sl_price:
             body["presetStopLossPrice"] = str(sl_price)
 
-        return await self.post("/api/v2/mix/order/place-order", body)
+        # Bir vaqtda kelgan orderlar bitta batch requestga yig'iladi
+        queue = self._get_batch_queue(
+            ("place", symbol, product_type, margin_coin),
+            self._flush_place_orders
+        )
+        return await queue.submit(body)
 
     async def cancel_order(self, symbol: str, order_id: str,
                            product_type: str = "USDT-FUTURES") -> Dict:
@@ -467,7 +871,88 @@ class BitgetClient:
             "productType": product_type,
             "orderId": order_id
         }
-        return await self.post("/api/v2/mix/order/cancel-order", body)
+        queue = self._get_batch_queue(
+            ("cancel", symbol, product_type),
+            self._flush_cancel_orders
+        )
+        return await queue.submit(body)
+
+    async def _flush_place_orders(self, orders: List[Dict]) -> List[Any]:
+        """
+        Orderlarni yuborish (1 ta - oddiy endpoint, ko'p - batch endpoint)
+
+        Returns:
+            Har bir order uchun javob yoki BitgetAPIError
+        """
+        if len(orders) == 1:
+            return [await self.post("/api/v2/mix/order/place-order", orders[0])]
+
+        first = orders[0]
+        order_list = []
+        client_oids = []
+        for order in orders:
+            item = {k: v for k, v in order.items()
+                    if k not in ("symbol", "productType", "marginMode", "marginCoin")}
+            # clientOid - javobni orderga moslash uchun
+            item.setdefault("clientOid", f"hg{uuid.uuid4().hex[:24]}")
+            client_oids.append(item["clientOid"])
+            order_list.append(item)
+
+        body = {
+            "symbol": first["symbol"],
+            "productType": first["productType"],
+            "marginMode": first["marginMode"],
+            "marginCoin": first["marginCoin"],
+            "orderList": order_list
+        }
+        data = await self.post("/api/v2/mix/order/batch-place-order", body)
+        return self._split_batch_result(data, "clientOid", client_oids)
+
+    async def _flush_cancel_orders(self, orders: List[Dict]) -> List[Any]:
+        """Orderlarni bekor qilish (1 ta - oddiy endpoint, ko'p - batch endpoint)"""
+        if len(orders) == 1:
+            return [await self.post("/api/v2/mix/order/cancel-order", orders[0])]
+
+        order_ids = [order["orderId"] for order in orders]
+        body = {
+            "symbol": orders[0]["symbol"],
+            "productType": orders[0]["productType"],
+            "orderIdList": [{"orderId": order_id} for order_id in order_ids]
+        }
+        data = await self.post("/api/v2/mix/order/batch-cancel-orders", body)
+        return self._split_batch_result(data, "orderId", order_ids)
+
+    @staticmethod
+    def _split_batch_result(data: Dict, key: str, keys: List[str]) -> List[Any]:
+        """
+        Batch javobini (successList / failureList) har bir order uchun ajratish
+
+        Args:
+            data: Batch endpoint javobi
+            key: Moslash uchun field ('clientOid' yoki 'orderId')
+            keys: Yuborilgan tartibdagi qiymatlar
+
+        Returns:
+            Har bir order uchun javob dict yoki BitgetAPIError
+        """
+        data = data or {}
+        success = {item.get(key): item for item in data.get("successList") or []}
+        failure = {item.get(key): item for item in data.get("failureList") or []}
+
+        results: List[Any] = []
+        for value in keys:
+            if value in success:
+                results.append(success[value])
+            elif value in failure:
+                item = failure[value]
+                results.append(BitgetAPIError(
+                    str(item.get("errorCode", "BATCH_ERROR")),
+                    item.get("errorMsg", "Batch order xatosi"),
+                    item
+                ))
+            else:
+                results.append(BitgetAPIError("BATCH_ERROR", f"Batch javobida topilmadi: {value}"))
+        return results
 
     async def get_open_orders(self, symbol: str = None,
                               product_type: str = "USDT-FUTURES") -> List[Dict]:
@@ -6,9 +6,10 @@ Barcha sozlamalar dataclass sifatida
 
 import os
 import logging
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Any, Callable, Optional, List
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -18,8 +19,16 @@ logger = logging.getLogger(__name__)
 #                               ENV LOADING
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def _load_env():
-    """Load .env file"""
+@lru_cache(maxsize=1)
+def _load_env() -> Optional[Path]:
+    """
+    Load .env file (jarayon davomida bir marta)
+
+    os.environ ga yoziladi - server.py kabi modullar ham os.getenv orqali o'qiydi.
+
+    Returns:
+        Yuklangan .env yo'li yoki None
+    """
     try:
         from dotenv import load_dotenv
 
@@ -34,39 +43,40 @@ def _load_env():
             if env_path.exists():
                 load_dotenv(env_path)
                 logger.debug(f"Loaded .env from: {env_path}")
-                return
+                return env_path
 
     except ImportError:
         pass
 
+    return None
+
 
 # Load on import
 _load_env()
 
 
-def _get_env(key: str, default: str = "") -> str:
-    """Get environment variable"""
-    return os.getenv(key, default)
-
+_TRUE_VALUES = frozenset(("true", "1", "yes", "on"))
 
-def _get_env_bool(key: str, default: bool = False) -> bool:
-    """Get boolean environment variable"""
-    value = os.getenv(key, str(default)).lower()
-    return value in ("true", "1", "yes", "on")
 
+# Env qiymatlari jarayon davomida o'zgarmaydi - har RobotConfig() da
+# os.getenv + parse qilmaslik uchun (key, default, cast) bo'yicha cache
+@lru_cache(maxsize=None)
+def _env(key: str, default: Any = "", cast: Callable = str) -> Any:
+    """
+    Environment variable olish va turga o'girish
 
-def _get_env_int(key: str, default: int = 0) -> int:
-    """Get integer environment variable"""
-    try:
-        return int(os.getenv(key, str(default)))
-    except ValueError:
+    Args:
+        key: Env nomi
+        default: Env yo'q yoki noto'g'ri bo'lsa qaytariladigan qiymat
+        cast: str, int, float yoki bool
+    """
+    value = os.environ.get(key)
+    if value is None:
         return default
-
-
-def _get_env_float(key: str, default: float = 0.0) -> float:
-    """Get float environment variable"""
+    if cast is bool:
+        return value.lower() in _TRUE_VALUES
     try:
-        return float(os.getenv(key, str(default)))
+        return cast(value)
     except ValueError:
         return default
 
@@ -76,28 +86,47 @@ def _get_env_float(key: str, default: float = 0.0) -> float:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 class Timeframe(Enum):
-    """Timeframe enumeration"""
-    M1 = "1m"
-    M5 = "5m"
-    M15 = "15m"
-    M30 = "30m"
-    H1 = "1H"
-    H4 = "4H"
-    D1 = "1D"
+    """
+    Timeframe enumeration
+
+    Har bir a'zo Bitget granularity qiymati va davomiyligini (soniya) saqlaydi:
+    Timeframe("1H").seconds == 3600
+    """
+    M1 = ("1m", 60)
+    M5 = ("5m", 300)
+    M15 = ("15m", 900)
+    M30 = ("30m", 1800)
+    H1 = ("1H", 3600)
+    H4 = ("4H", 14400)
+    D1 = ("1D", 86400)
+
+    def __new__(cls, value: str, seconds: int):
+        member = object.__new__(cls)
+        member._value_ = value
+        member.seconds = seconds
+        member.ms = seconds * 1000
+        return member
+
+    def bar_start(self, timestamp_ms: int) -> int:
+        """Timestamp (ms) tegishli bo'lgan sham boshlanish vaqti (ms)"""
+        return timestamp_ms - timestamp_ms % self.ms
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #                               CONFIG CLASSES
 # ═══════════════════════════════════════════════════════════════════════════════
+#
+# Sub-configlar o'zgarmas (frozen, slots) - tick davomida faqat o'qiladi.
+# Qiymatni o'zgartirish: dataclasses.replace(config.trading, LEVERAGE=20)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class APIConfig:
     """Bitget API konfiguratsiyasi"""
 
-    DEMO_MODE: bool = field(default_factory=lambda: _get_env_bool("DEMO_MODE", True))
-    API_KEY: str = field(default_factory=lambda: _get_env("BITGET_API_KEY", ""))
-    SECRET_KEY: str = field(default_factory=lambda: _get_env("BITGET_SECRET_KEY", ""))
-    PASSPHRASE: str = field(default_factory=lambda: _get_env("BITGET_PASSPHRASE", ""))
+    DEMO_MODE: bool = field(default_factory=lambda: _env("DEMO_MODE", True, bool))
+    API_KEY: str = field(default_factory=lambda: _env("BITGET_API_KEY", ""))
+    SECRET_KEY: str = field(default_factory=lambda: _env("BITGET_SECRET_KEY", ""))
+    PASSPHRASE: str = field(default_factory=lambda: _env("BITGET_PASSPHRASE", ""))
 
     # URLs
     BASE_URL: str = field(default="")
@@ -105,19 +134,20 @@ class APIConfig:
     WS_PRIVATE_URL: str = field(default="")
 
     # Request settings
-    TIMEOUT: int = field(default_factory=lambda: _get_env_int("API_TIMEOUT", 30))
-    MAX_RETRIES: int = field(default_factory=lambda: _get_env_int("API_MAX_RETRIES", 3))
+    TIMEOUT: int = field(default_factory=lambda: _env("API_TIMEOUT", 30, int))
+    MAX_RETRIES: int = field(default_factory=lambda: _env("API_MAX_RETRIES", 3, int))
+    TICKER_TTL: float = field(default_factory=lambda: _env("API_TICKER_TTL", 0.05, float))  # soniya
 
     def __post_init__(self):
-        """Set URLs based on demo mode"""
+        """Set URLs based on demo mode (frozen - object.__setattr__ orqali)"""
         if self.DEMO_MODE:
-            self.BASE_URL = "https://api.bitget.com"
-            self.WS_PUBLIC_URL = "wss://ws.bitget.com/v2/ws/public"
-            self.WS_PRIVATE_URL = "wss://ws.bitget.com/v2/ws/private"
+            object.__setattr__(self, "BASE_URL", "https://api.bitget.com")
+            object.__setattr__(self, "WS_PUBLIC_URL", "wss://ws.bitget.com/v2/ws/public")
+            object.__setattr__(self, "WS_PRIVATE_URL", "wss://ws.bitget.com/v2/ws/private")
         else:
-            self.BASE_URL = "https://api.bitget.com"
-            self.WS_PUBLIC_URL = "wss://ws.bitget.com/v2/ws/public"
-            self.WS_PRIVATE_URL = "wss://ws.bitget.com/v2/ws/private"
+            object.__setattr__(self, "BASE_URL", "https://api.bitget.com")
+            object.__setattr__(self, "WS_PUBLIC_URL", "wss://ws.bitget.com/v2/ws/public")
+            object.__setattr__(self, "WS_PRIVATE_URL", "wss://ws.bitget.com/v2/ws/private")
 
     def is_configured(self) -> bool:
         """Check if API credentials are configured"""
@@ -130,43 +160,43 @@ class APIConfig:
         return f"{key[:4]}...{key[-4:]}"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradingConfig:
     """Trading sozlamalari"""
 
-    SYMBOL: str = field(default_factory=lambda: _get_env("TRADING_SYMBOL", "BTCUSDT"))
+    SYMBOL: str = field(default_factory=lambda: _env("TRADING_SYMBOL", "BTCUSDT"))
     PRODUCT_TYPE: str = "USDT-FUTURES"
     MARGIN_MODE: str = "crossed"
     MARGIN_COIN: str = "USDT"
-    LEVERAGE: int = field(default_factory=lambda: _get_env_int("LEVERAGE", 10))
+    LEVERAGE: int = field(default_factory=lambda: _env("LEVERAGE", 10, int))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GridConfig:
     """Grid trading sozlamalari"""
 
     # Martingale multiplier (0 = fixed lot, >0 = martingale)
-    MULTIPLIER: float = field(default_factory=lambda: _get_env_float("MULTIPLIER", 1.5))
+    MULTIPLIER: float = field(default_factory=lambda: _env("MULTIPLIER", 1.5, float))
 
     # Grid Level 1
-    SPACE_PERCENT: float = field(default_factory=lambda: _get_env_float("SPACE_PERCENT", 0.5))
-    SPACE_ORDERS: int = field(default_factory=lambda: _get_env_int("SPACE_ORDERS", 5))
-    SPACE_LOTS: float = field(default_factory=lambda: _get_env_float("SPACE_LOTS", 0.01))
+    SPACE_PERCENT: float = field(default_factory=lambda: _env("SPACE_PERCENT", 0.5, float))
+    SPACE_ORDERS: int = field(default_factory=lambda: _env("SPACE_ORDERS", 5, int))
+    SPACE_LOTS: float = field(default_factory=lambda: _env("SPACE_LOTS", 0.01, float))
 
     # Grid Level 2
-    SPACE1_PERCENT: float = field(default_factory=lambda: _get_env_float("SPACE1_PERCENT", 1.5))
-    SPACE1_ORDERS: int = field(default_factory=lambda: _get_env_int("SPACE1_ORDERS", 1))
-    SPACE1_LOTS: float = field(default_factory=lambda: _get_env_float("SPACE1_LOTS", 0.02))
+    SPACE1_PERCENT: float = field(default_factory=lambda: _env("SPACE1_PERCENT", 1.5, float))
+    SPACE1_ORDERS: int = field(default_factory=lambda: _env("SPACE1_ORDERS", 1, int))
+    SPACE1_LOTS: float = field(default_factory=lambda: _env("SPACE1_LOTS", 0.02, float))
 
     # Grid Level 3
-    SPACE2_PERCENT: float = field(default_factory=lambda: _get_env_float("SPACE2_PERCENT", 3.0))
-    SPACE2_ORDERS: int = field(default_factory=lambda: _get_env_int("SPACE2_ORDERS", 1))
-    SPACE2_LOTS: float = field(default_factory=lambda: _get_env_float("SPACE2_LOTS", 0.03))
+    SPACE2_PERCENT: float = field(default_factory=lambda: _env("SPACE2_PERCENT", 3.0, float))
+    SPACE2_ORDERS: int = field(default_factory=lambda: _env("SPACE2_ORDERS", 1, int))
+    SPACE2_LOTS: float = field(default_factory=lambda: _env("SPACE2_LOTS", 0.03, float))
 
     # Grid Level 4
-    SPACE3_PERCENT: float = field(default_factory=lambda: _get_env_float("SPACE3_PERCENT", 5.0))
-    SPACE3_ORDERS: int = field(default_factory=lambda: _get_env_int("SPACE3_ORDERS", 99))
-    SPACE3_LOTS: float = field(default_factory=lambda: _get_env_float("SPACE3_LOTS", 0.09))
+    SPACE3_PERCENT: float = field(default_factory=lambda: _env("SPACE3_PERCENT", 5.0, float))
+    SPACE3_ORDERS: int = field(default_factory=lambda: _env("SPACE3_ORDERS", 99, int))
+    SPACE3_LOTS: float = field(default_factory=lambda: _env("SPACE3_LOTS", 0.09, float))
 
     def get_max_orders(self) -> int:
         """Get total max orders for one side"""
@@ -215,54 +245,54 @@ class GridConfig:
         return errors
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EntryConfig:
     """Entry signal sozlamalari"""
 
     # SMA/Parabolic SAR entry
-    USE_SMA_SAR: bool = field(default_factory=lambda: _get_env_bool("USE_SMA_SAR", True))
-    SMA_PERIOD: int = field(default_factory=lambda: _get_env_int("SMA_PERIOD", 7))
-    SAR_AF: float = field(default_factory=lambda: _get_env_float("SAR_AF", 0.1))
-    SAR_MAX: float = field(default_factory=lambda: _get_env_float("SAR_MAX", 0.8))
-    REVERSE_ORDER: bool = field(default_factory=lambda: _get_env_bool("REVERSE_ORDER", False))
+    USE_SMA_SAR: bool = field(default_factory=lambda: _env("USE_SMA_SAR", True, bool))
+    SMA_PERIOD: int = field(default_factory=lambda: _env("SMA_PERIOD", 7, int))
+    SAR_AF: float = field(default_factory=lambda: _env("SAR_AF", 0.1, float))
+    SAR_MAX: float = field(default_factory=lambda: _env("SAR_MAX", 0.8, float))
+    REVERSE_ORDER: bool = field(default_factory=lambda: _env("REVERSE_ORDER", False, bool))
 
     # CCI entry (0 = disabled)
-    CCI_PERIOD: int = field(default_factory=lambda: _get_env_int("CCI_PERIOD", 0))
-    CCI_MAX: float = field(default_factory=lambda: _get_env_float("CCI_MAX", 100.0))
-    CCI_MIN: float = field(default_factory=lambda: _get_env_float("CCI_MIN", -100.0))
+    CCI_PERIOD: int = field(default_factory=lambda: _env("CCI_PERIOD", 0, int))
+    CCI_MAX: float = field(default_factory=lambda: _env("CCI_MAX", 100.0, float))
+    CCI_MIN: float = field(default_factory=lambda: _env("CCI_MIN", -100.0, float))
 
     # Timeframe
-    TIMEFRAME: str = field(default_factory=lambda: _get_env("TIMEFRAME", "1H"))
+    TIMEFRAME: str = field(default_factory=lambda: _env("TIMEFRAME", "1H"))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProfitConfig:
     """Profit/loss sozlamalari"""
 
     # Single order profit (USDT)
-    SINGLE_ORDER_PROFIT: float = field(default_factory=lambda: _get_env_float("SINGLE_ORDER_PROFIT", 3.0))
+    SINGLE_ORDER_PROFIT: float = field(default_factory=lambda: _env("SINGLE_ORDER_PROFIT", 3.0, float))
 
     # Pair (buy+sell) global profit (USDT)
-    PAIR_GLOBAL_PROFIT: float = field(default_factory=lambda: _get_env_float("PAIR_GLOBAL_PROFIT", 1.0))
+    PAIR_GLOBAL_PROFIT: float = field(default_factory=lambda: _env("PAIR_GLOBAL_PROFIT", 1.0, float))
 
     # Global profit target (USDT, 0 = disabled)
-    GLOBAL_PROFIT: float = field(default_factory=lambda: _get_env_float("GLOBAL_PROFIT", 0.0))
+    GLOBAL_PROFIT: float = field(default_factory=lambda: _env("GLOBAL_PROFIT", 0.0, float))
 
     # Maximum loss (USDT, 0 = disabled)
-    MAX_LOSS: float = field(default_factory=lambda: _get_env_float("MAX_LOSS", 0.0))
+    MAX_LOSS: float = field(default_factory=lambda: _env("MAX_LOSS", 0.0, float))
 
     # Trades per day limit
-    TRADES_PER_DAY: int = field(default_factory=lambda: _get_env_int("TRADES_PER_DAY", 99))
+    TRADES_PER_DAY: int = field(default_factory=lambda: _env("TRADES_PER_DAY", 99, int))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TimeConfig:
     """Vaqt filtri sozlamalari"""
 
-    START_HOUR: int = field(default_factory=lambda: _get_env_int("START_HOUR", 0))
-    START_MINUTE: int = field(default_factory=lambda: _get_env_int("START_MINUTE", 0))
-    FINISH_HOUR: int = field(default_factory=lambda: _get_env_int("FINISH_HOUR", 23))
-    FINISH_MINUTE: int = field(default_factory=lambda: _get_env_int("FINISH_MINUTE", 59))
+    START_HOUR: int = field(default_factory=lambda: _env("START_HOUR", 0, int))
+    START_MINUTE: int = field(default_factory=lambda: _env("START_MINUTE", 0, int))
+    FINISH_HOUR: int = field(default_factory=lambda: _env("FINISH_HOUR", 23, int))
+    FINISH_MINUTE: int = field(default_factory=lambda: _env("FINISH_MINUTE", 59, int))
 
     def is_24h(self) -> bool:
         """Check if 24h trading enabled"""
@@ -270,20 +300,20 @@ class TimeConfig:
                 self.FINISH_HOUR == 23 and self.FINISH_MINUTE >= 59)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MoneyConfig:
     """Money management sozlamalari"""
 
     # Base lot size
-    BASE_LOT: float = field(default_factory=lambda: _get_env_float("BASE_LOT", 0.01))
+    BASE_LOT: float = field(default_factory=lambda: _env("BASE_LOT", 0.01, float))
 
     # Lot limits
-    MIN_LOT: float = field(default_factory=lambda: _get_env_float("MIN_LOT", 0.001))
-    MAX_LOT: float = field(default_factory=lambda: _get_env_float("MAX_LOT", 50.0))
+    MIN_LOT: float = field(default_factory=lambda: _env("MIN_LOT", 0.001, float))
+    MAX_LOT: float = field(default_factory=lambda: _env("MAX_LOT", 50.0, float))
 
     # Money management
-    USE_MM: bool = field(default_factory=lambda: _get_env_bool("USE_MM", False))
-    RISK_PERCENT: float = field(default_factory=lambda: _get_env_float("RISK_PERCENT", 2.0))
+    USE_MM: bool = field(default_factory=lambda: _env("USE_MM", False, bool))
+    RISK_PERCENT: float = field(default_factory=lambda: _env("RISK_PERCENT", 2.0, float))
 
 
 @dataclass
@@ -300,13 +330,14 @@ class RobotConfig:
     money: MoneyConfig = field(default_factory=MoneyConfig)
 
     # Robot info
-    ROBOT_NAME: str = field(default_factory=lambda: _get_env("BOT_NAME", "Hedging Grid Robot"))
-    VERSION: str = field(default_factory=lambda: _get_env("BOT_VERSION", "1.0.0"))
+    ROBOT_NAME: str = field(default_factory=lambda: _env("BOT_NAME", "Hedging Grid Robot"))
+    VERSION: str = field(default_factory=lambda: _env("BOT_VERSION", "1.0.0"))
 
     # Runtime settings
-    DEBUG: bool = field(default_factory=lambda: _get_env_bool("DEBUG", False))
-    TICK_INTERVAL: float = field(default_factory=lambda: _get_env_float("TICK_INTERVAL", 1.0))
-    OPEN_ON_NEW_CANDLE: bool = field(default_factory=lambda: _get_env_bool("OPEN_ON_NEW_CANDLE", True))
+    DEBUG: bool = field(default_factory=lambda: _env("DEBUG", False, bool))
+    TICK_INTERVAL: float = field(default_factory=lambda: _env("TICK_INTERVAL", 1.0, float))
+    OPEN_ON_NEW_CANDLE: bool = field(default_factory=lambda: _env("OPEN_ON_NEW_CANDLE", True, bool))
+    USE_WEBSOCKET: bool = field(default_factory=lambda: _env("USE_WEBSOCKET", True, bool))
 
     def validate(self) -> List[str]:
         """Validate configuration and return list of errors"""
@@ -2,22 +2,41 @@
 Hedging Grid Robot - Texnik Indikatorlar
 
 SMA, Parabolic SAR, CCI indikatorlari
+
+Indikatorlar List[Candle] yoki CandleSeries (ustunlar) qabul qiladi.
 """
 
 import logging
-from typing import List, Optional
-from dataclasses import dataclass
+from array import array
+from collections import deque
+from operator import attrgetter, mul
+from typing import Callable, Deque, List, Optional, Sequence, Union
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+# Numba (ixtiyoriy) - bo'lsa SAR qadami kompilyatsiya qilinadi
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """numba o'rnatilmagan - funksiya oddiy Python sifatida qoladi"""
+        def decorator(func):
+            return func
+        return decorator
+
+# Incremental yig'indilar float xatosini to'plamasligi uchun
+# shuncha yangilanishdan keyin oyna qaytadan hisoblanadi
+RESEED_INTERVAL = 1000
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #                               CANDLE DATA
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Candle:
-    """OHLCV candle ma'lumotlari"""
+    """OHLCV candle ma'lumotlari (o'zgarmas - yangilanganda yangi obyekt)"""
     timestamp: int
     open: float
     high: float
@@ -25,6 +44,14 @@ class Candle:
     close: float
     volume: float
 
+    # Hosila narxlar - yaratilganda bir marta hisoblanadi
+    typical: float = field(init=False, repr=False, compare=False)    # HLC/3
+    weighted: float = field(init=False, repr=False, compare=False)   # HLCC/4
+
+    def __post_init__(self):
+        object.__setattr__(self, 'typical', (self.high + self.low + self.close) / 3)
+        object.__setattr__(self, 'weighted', (self.high + self.low + self.close + self.close) / 4)
+
     @classmethod
     def from_bitget(cls, data: List) -> 'Candle':
         """
@@ -43,11 +70,202 @@ class Candle:
 
     def get_typical_price(self) -> float:
         """Typical price (HLC/3)"""
-        return (self.high + self.low + self.close) / 3
+        return self.typical
 
     def get_weighted_price(self) -> float:
         """Weighted price (HLCC/4)"""
-        return (self.high + self.low + self.close + self.close) / 4
+        return self.weighted
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#                               CANDLE SERIES (SoA)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class CandleSeries:
+    """
+    Candlelar ustunlar ko'rinishida (Structure of Arrays)
+
+    Har bir ustun - typed array ('q' / 'd'), candle boshiga ~64 bayt,
+    Python obyektlari yo'q. Indikatorlar to'g'ridan-to'g'ri ustunlarni
+    indekslaydi.
+    """
+
+    __slots__ = ('timestamp', 'open', 'high', 'low', 'close', 'volume',
+                 'typical', 'weighted')
+
+    def __init__(self):
+        self.timestamp = array('q')
+        self.open = array('d')
+        self.high = array('d')
+        self.low = array('d')
+        self.close = array('d')
+        self.volume = array('d')
+        # Hosila ustunlar - append paytida bir marta hisoblanadi
+        self.typical = array('d')    # HLC/3
+        self.weighted = array('d')   # HLCC/4
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, i: int) -> Candle:
+        """Bitta qatorni Candle sifatida olish (moslik uchun)"""
+        return Candle(
+            timestamp=self.timestamp[i],
+            open=self.open[i],
+            high=self.high[i],
+            low=self.low[i],
+            close=self.close[i],
+            volume=self.volume[i]
+        )
+
+    def append(self, timestamp: int, open_: float, high: float,
+               low: float, close: float, volume: float = 0.0):
+        """Yangi candle qo'shish"""
+        self.timestamp.append(timestamp)
+        self.open.append(open_)
+        self.high.append(high)
+        self.low.append(low)
+        self.close.append(close)
+        self.volume.append(volume)
+        self.typical.append((high + low + close) / 3)
+        self.weighted.append((high + low + close + close) / 4)
+
+    def set(self, i: int, timestamp: int, open_: float, high: float,
+            low: float, close: float, volume: float = 0.0):
+        """i-qatorni almashtirish (masalan, joriy candle yangilandi)"""
+        self.timestamp[i] = timestamp
+        self.open[i] = open_
+        self.high[i] = high
+        self.low[i] = low
+        self.close[i] = close
+        self.volume[i] = volume
+        self.typical[i] = (high + low + close) / 3
+        self.weighted[i] = (high + low + close + close) / 4
+
+    def row(self, i: int) -> tuple:
+        """i-qator: (timestamp, open, high, low, close, volume)"""
+        return (self.timestamp[i], self.open[i], self.high[i],
+                self.low[i], self.close[i], self.volume[i])
+
+    def tail(self, count: int) -> 'CandleSeries':
+        """Oxirgi count ta candle - har ustun array slice (C darajasida nusxa)"""
+        start = max(0, len(self.timestamp) - count)
+        series = CandleSeries.__new__(CandleSeries)
+        for name in self.__slots__:
+            setattr(series, name, getattr(self, name)[start:])
+        return series
+
+    def extend(self, other: 'CandleSeries'):
+        """Boshqa seriyani oxiriga qo'shish (har ustun bitta array.extend)"""
+        for name in self.__slots__:
+            getattr(self, name).extend(getattr(other, name))
+
+    def drop_front(self, count: int):
+        """Eng eski count ta candle ni olib tashlash"""
+        for name in self.__slots__:
+            del getattr(self, name)[:count]
+
+    @classmethod
+    def from_bitget(cls, batch: List[List]) -> 'CandleSeries':
+        """
+        Bitget candles javobidan to'g'ridan-to'g'ri ustunlar yaratish
+
+        Candle obyektlari yaratilmaydi - har ustun bitta o'tishda parse qilinadi.
+        Bitget format: [timestamp, open, high, low, close, volume, ...]
+        """
+        series = cls()
+        if not batch:
+            return series
+
+        # Satrlarni ustunlarga transpose qilish (volume bo'lmasa 0)
+        rows = [row if len(row) > 5 else (*row[:5], 0.0) for row in batch]
+        ts_col, open_col, high_col, low_col, close_col, vol_col = zip(*(row[:6] for row in rows))
+
+        series.timestamp = array('q', map(int, ts_col))
+        series.open = array('d', map(float, open_col))
+        series.high = array('d', map(float, high_col))
+        series.low = array('d', map(float, low_col))
+        series.close = array('d', map(float, close_col))
+        series.volume = array('d', map(float, vol_col))
+        series.typical = array('d', [
+            (h + l + c) / 3 for h, l, c in zip(series.high, series.low, series.close)
+        ])
+        series.weighted = array('d', [
+            (h + l + c + c) / 4 for h, l, c in zip(series.high, series.low, series.close)
+        ])
+        return series
+
+    @classmethod
+    def from_candles(cls, candles: List[Candle]) -> 'CandleSeries':
+        """List[Candle] dan yaratish"""
+        series = cls()
+        for c in candles:
+            series.append(c.timestamp, c.open, c.high, c.low, c.close, c.volume)
+        return series
+
+    def to_candles(self) -> List[Candle]:
+        """List[Candle] ga o'girish"""
+        return [self[i] for i in range(len(self))]
+
+
+class _Column:
+    """List[Candle] ustidan bitta ustun ko'rinishi (nusxa olmasdan)"""
+
+    __slots__ = ('_candles', '_get')
+
+    def __init__(self, candles: List[Candle], get: Callable[[Candle], float]):
+        self._candles = candles
+        self._get = get
+
+    def __len__(self) -> int:
+        return len(self._candles)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._get(c) for c in self._candles[i]]
+        return self._get(self._candles[i])
+
+
+class _CandleColumns:
+    """List[Candle] uchun CandleSeries bilan bir xil ustun interfeysi"""
+
+    __slots__ = ('timestamp', 'high', 'low', 'close', 'typical', 'weighted')
+
+    def __init__(self, candles: List[Candle]):
+        self.timestamp = _Column(candles, attrgetter('timestamp'))
+        self.high = _Column(candles, attrgetter('high'))
+        self.low = _Column(candles, attrgetter('low'))
+        self.close = _Column(candles, attrgetter('close'))
+        self.typical = _Column(candles, attrgetter('typical'))
+        self.weighted = _Column(candles, attrgetter('weighted'))
+
+
+Candles = Union[List[Candle], CandleSeries]
+
+
+def _as_columns(candles: Candles):
+    """Indikatorlar uchun ustunlar - CandleSeries o'zi, ro'yxat uchun adapter"""
+    if isinstance(candles, CandleSeries):
+        return candles
+    return _CandleColumns(candles)
+
+
+def _find_timestamp(timestamps: Sequence[int], timestamp: Optional[int]) -> Optional[int]:
+    """
+    Berilgan timestamp indeksini oxiridan qidirish
+
+    Odatda oxirgi 1-2 candle ichida topiladi. Topilmasa (cache qayta
+    yuklangan, uzilish) None - indikator oynani qaytadan hisoblaydi.
+    """
+    if timestamp is None:
+        return None
+    for i in range(len(timestamps) - 1, -1, -1):
+        ts = timestamps[i]
+        if ts == timestamp:
+            return i
+        if ts < timestamp:
+            return None
+    return None
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -59,6 +277,9 @@ class SMAIndicator:
     Simple Moving Average (SMA) / Linear Weighted Moving Average (LWMA)
 
     MQL4 dan: iMA(NULL, 0, 7, 0, MODE_LWMA, PRICE_WEIGHTED, 0)
+
+    Incremental: har yangi candle uchun O(1) yangilanadi (to'liq qayta
+    hisoblash faqat boshida, uzilishda va har RESEED_INTERVAL da).
     """
 
     def __init__(self, period: int = 7, ma_type: str = 'lwma'):
@@ -71,54 +292,227 @@ class SMAIndicator:
         self.ma_type = ma_type.lower()
         self._last_value: float = 0.0
 
+        # LWMA og'irliklari faqat period ga bog'liq - bir marta hisoblanadi
+        self._weights = tuple(range(1, period + 1))
+        self._weight_sum = period * (period + 1) // 2
+
+        # Incremental holat
+        self._prices: Deque[float] = deque(maxlen=period)
+        self._psum: float = 0.0          # sum(price)
+        self._wsum: float = 0.0          # sum(weight * price), weights 1..n
+        self._last_ts: Optional[int] = None
+        self._updates: int = 0
+        self._warned: bool = False
+
     @property
     def value(self) -> float:
         """Oxirgi hisoblangan qiymat"""
         return self._last_value
 
-    def calculate(self, candles: List[Candle]) -> float:
+    def reset(self):
+        """Reset indicator state"""
+        self._prices.clear()
+        self._psum = 0.0
+        self._wsum = 0.0
+        self._last_ts = None
+        self._updates = 0
+        self._last_value = 0.0
+
+    def calculate(self, candles: Candles) -> float:
         """
         MA ni hisoblash
 
+        Faqat oxirgi chaqiruvdan keyin kelgan candlelar qo'shiladi;
+        joriy (shakllanayotgan) candle o'zgarsa, oynadagi oxirgi qiymat
+        almashtiriladi.
+
         Args:
-            candles: Candle ro'yxati (eng yangisi oxirida)
+            candles: Candle ro'yxati yoki CandleSeries (eng yangisi oxirida)
 
         Returns:
             MA qiymati
         """
-        if len(candles) < self.period:
-            logger.warning(f"SMA: Not enough candles ({len(candles)} < {self.period})")
+        n = len(candles)
+        if n < self.period:
+            # Warm-up paytida har tickda emas, bir marta ogohlantirish
+            if not self._warned:
+                self._warned = True
+                logger.warning("SMA: Not enough candles (%d < %d)", n, self.period)
             return 0.0
+        self._warned = False
 
-        # Oxirgi N ta candle
-        recent = candles[-self.period:]
+        cols = _as_columns(candles)
+        timestamps = cols.timestamp
+        weighted = cols.weighted
 
-        if self.ma_type == 'lwma':
-            # Linear Weighted MA (M8 fix - eng yangi ma'lumotga eng katta og'irlik)
-            # Weights: period, period-1, ..., 2, 1 (eng yangi = period, eng eski = 1)
-            weighted_sum = 0.0
-            weight_sum = 0
-
-            for i, candle in enumerate(recent):
-                # i=0 -> weight=1, i=period-1 -> weight=period
-                weight = i + 1
-                price = candle.get_weighted_price()
-                weighted_sum += price * weight
-                weight_sum += weight
-
-            self._last_value = weighted_sum / weight_sum if weight_sum > 0 else 0.0
+        k = _find_timestamp(timestamps, self._last_ts)
+        if (k is None or self._updates >= RESEED_INTERVAL
+                or n - 1 - k >= self.period):
+            self._seed(weighted, n, timestamps[-1])
         else:
-            # Simple MA
-            prices = [c.get_weighted_price() for c in recent]
-            self._last_value = sum(prices) / len(prices)
+            self._replace_last(weighted[k])
+            for i in range(k + 1, n):
+                self._push(weighted[i], timestamps[i])
+
+        self._last_value = self._compute()
+        return self._last_value
 
+    def update(self, candle: Candle) -> float:
+        """Yangi candle qo'shish - O(1)"""
+        self._push(candle.weighted, candle.timestamp)
+        self._last_value = self._compute()
         return self._last_value
 
+    def _push(self, price: float, timestamp: int):
+        """
+        Oynaga yangi narx qo'shish
+
+        LWMA siljishi: wsum' = wsum + N * new - psum, psum' = psum + new - dropped
+        """
+        prices = self._prices
+
+        if len(prices) == self.period:
+            dropped = prices[0]
+            self._wsum += self.period * price - self._psum
+            self._psum += price - dropped
+        else:
+            # Oyna hali to'lmagan - yangi qiymat og'irligi n+1
+            self._wsum += (len(prices) + 1) * price
+            self._psum += price
+
+        prices.append(price)
+        self._last_ts = timestamp
+        self._updates += 1
+
+    def _replace_last(self, price: float):
+        """Oynadagi eng yangi qiymatni almashtirish (joriy candle yangilandi)"""
+        delta = price - self._prices[-1]
+        if delta:
+            self._prices[-1] = price
+            self._psum += delta
+            self._wsum += len(self._prices) * delta
+        self._updates += 1
+
+    def _seed(self, weighted: Sequence[float], n: int, last_ts: int):
+        """Oynani oxirgi N ta narxdan to'liq hisoblash (slice nusxasiz)"""
+        prices = self._prices
+        prices.clear()
+        prices.extend(weighted[i] for i in range(n - self.period, n))
+        self._psum = sum(prices)
+        # Dot product map(mul) orqali - Python loop siz, C darajasida
+        self._wsum = sum(map(mul, self._weights, prices))
+        self._last_ts = last_ts
+        self._updates = 0
+
+    def _compute(self) -> float:
+        """Joriy yig'indilardan MA qiymati"""
+        n = len(self._prices)
+        if n == 0:
+            return 0.0
+
+        if self.ma_type == 'lwma':
+            # Linear Weighted MA (M8 fix - eng yangi ma'lumotga eng katta og'irlik)
+            # Weights: 1, 2, ..., period (eng eski = 1, eng yangi = period)
+            weight_sum = self._weight_sum if n == self.period else n * (n + 1) // 2
+            return self._wsum / weight_sum
+
+        # Simple MA
+        return self._psum / n
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #                           PARABOLIC SAR INDICATOR
 # ═══════════════════════════════════════════════════════════════════════════════
 
+@njit(cache=True)
+def _sar_step(high: float, low: float, prev_high: float, prev_low: float,
+              prev2_high: float, prev2_low: float,
+              sar: float, ep: float, af: float, is_long: bool,
+              af_start: float, af_max: float):
+    """
+    Parabolic SAR bitta qadami (numba bo'lsa - kompilyatsiya qilingan)
+
+    Returns:
+        (sar, ep, af, is_long)
+    """
+    # Calculate new SAR
+    new_sar = sar + af * (ep - sar)
+    # min()/max() builtin o'rniga shartli ifoda - CPython da funksiya
+    # chaqiruvi yo'q, numba da minsd/maxsd ga kompilyatsiya bo'ladi
+    next_af = af + af_start
+    next_af = next_af if next_af < af_max else af_max
+
+    if is_long:
+        # Long trend
+        # SAR can't be above previous two lows
+        floor = prev_low if prev_low < prev2_low else prev2_low
+        new_sar = new_sar if new_sar < floor else floor
+
+        # Check for reversal
+        if low < new_sar:
+            # Reverse to short
+            return ep, low, af_start, False
+
+        # Update EP if new high
+        if high > ep:
+            return new_sar, high, next_af, True
+    else:
+        # Short trend
+        # SAR can't be below previous two highs
+        ceil = prev_high if prev_high > prev2_high else prev2_high
+        new_sar = new_sar if new_sar > ceil else ceil
+
+        # Check for reversal
+        if high > new_sar:
+            # Reverse to long
+            return ep, high, af_start, True
+
+        # Update EP if new low
+        if low < ep:
+            return new_sar, low, next_af, False
+
+    return new_sar, ep, af, is_long
+
+
+@njit(cache=True)
+def _sar_bulk(high, low, close, af_start: float, af_max: float):
+    """
+    Butun tarix bo'yicha SAR - bitta o'tishda (warm-up / backfill)
+
+    Dastlabki trend birinchi 5 ta candle dan (_initialize bilan bir xil),
+    keyin har bir candle uchun _sar_step.
+
+    Returns:
+        (sar, ep, af, is_long)
+    """
+    sar_low = low[0]
+    ep_high = high[0]
+    sar_high = high[0]
+    ep_low = low[0]
+    for i in range(1, 5):
+        sar_low = min(sar_low, low[i])
+        ep_high = max(ep_high, high[i])
+        sar_high = max(sar_high, high[i])
+        ep_low = min(ep_low, low[i])
+
+    if close[4] > close[0]:
+        is_long = True
+        sar = sar_low
+        ep = ep_high
+    else:
+        is_long = False
+        sar = sar_high
+        ep = ep_low
+    af = af_start
+
+    for i in range(5, len(high)):
+        sar, ep, af, is_long = _sar_step(
+            high[i], low[i], high[i - 1], low[i - 1], high[i - 2], low[i - 2],
+            sar, ep, af, is_long, af_start, af_max
+        )
+    return sar, ep, af, is_long
+
+
 class ParabolicSARIndicator:
     """
     Parabolic SAR (Stop and Reverse)
@@ -126,6 +520,9 @@ class ParabolicSARIndicator:
     MQL4 dan: iSAR(NULL, 0, 0.1, 0.8, 0)
     """
 
+    __slots__ = ('af_start', 'af_max', '_is_long', '_sar', '_ep', '_af',
+                 '_initialized', '_last_value', '_last_ts')
+
     def __init__(self, af_start: float = 0.1, af_max: float = 0.8):
         """
         Args:
@@ -142,6 +539,8 @@ class ParabolicSARIndicator:
         self._af: float = af_start
         self._initialized: bool = False
         self._last_value: float = 0.0
+        # update_closed: oxirgi qadam tashlangan (yopilgan) sham timestamp'i
+        self._last_ts: Optional[int] = None
 
     @property
     def value(self) -> float:
@@ -156,6 +555,7 @@ class ParabolicSARIndicator:
         self._af = self.af_start
         self._initialized = False
         self._last_value = 0.0
+        self._last_ts = None
 
     def save_state(self) -> dict:
         """Indikator holatini saqlash (M6 fix)"""
@@ -165,7 +565,8 @@ class ParabolicSARIndicator:
             "ep": self._ep,
             "af": self._af,
             "initialized": self._initialized,
-            "last_value": self._last_value
+            "last_value": self._last_value,
+            "last_ts": self._last_ts
         }
 
     def load_state(self, state: dict):
@@ -176,93 +577,131 @@ class ParabolicSARIndicator:
         self._af = state.get("af", self.af_start)
         self._initialized = state.get("initialized", False)
         self._last_value = state.get("last_value", 0.0)
+        self._last_ts = state.get("last_ts")
 
-    def calculate(self, candles: List[Candle]) -> float:
+    def calculate(self, candles: Candles) -> float:
         """
         Parabolic SAR ni hisoblash
 
         Args:
-            candles: Candle ro'yxati (eng yangisi oxirida)
+            candles: Candle ro'yxati yoki CandleSeries (eng yangisi oxirida)
 
         Returns:
             SAR qiymati
         """
-        if len(candles) < 2:
+        n = len(candles)
+        if n < 2:
             return 0.0
 
+        cols = _as_columns(candles)
+
         # Initialize on first call
         if not self._initialized:
-            self._initialize(candles)
+            self._initialize(cols)
+            return self._last_value
+
+        high = cols.high
+        low = cols.low
+        # 2 ta candle bo'lsa, 3-chi o'rniga oldingisi (min/max natijasi bir xil)
+        i3 = -3 if n >= 3 else -2
+
+        sar, self._ep, self._af, self._is_long = _sar_step(
+            high[-1], low[-1], high[-2], low[-2], high[i3], low[i3],
+            self._sar, self._ep, self._af, self._is_long,
+            self.af_start, self.af_max
+        )
+        self._sar = self._last_value = sar
+        return sar
+
+    def update_closed(self, candles: Candles) -> float:
+        """
+        SAR ni faqat yopilgan shamlar bo'yicha yangilash
+
+        Oxirgi qator - shakllanayotgan sham (yangi sham ochilganda odatda
+        bitta tick: open~high~low) - hisobga olinmaydi. Oldingi chaqiruvdan
+        beri yopilgan har bir sham uchun bitta _sar_step: reversal va EP
+        yopilgan shamning to'liq high/low i bilan tekshiriladi. Birinchi
+        chaqiruvda yoki oxirgi qadam oynada topilmasa (cache qayta yuklangan,
+        uzilish) - holat yopilgan shamlar bo'yicha bulk qayta quriladi.
+
+        Args:
+            candles: Candle ro'yxati yoki CandleSeries (eng yangisi oxirida)
+
+        Returns:
+            SAR qiymati (oxirgi yopilgan sham uchun)
+        """
+        cols = _as_columns(candles)
+        timestamps = cols.timestamp
+        last = len(timestamps) - 2  # oxirgi yopilgan sham indeksi
+        if last < 4:
             return self._last_value
 
-        # Current candle
-        current = candles[-1]
-        prev = candles[-2]
-
-        # Calculate new SAR
-        new_sar = self._sar + self._af * (self._ep - self._sar)
-
-        if self._is_long:
-            # Long trend
-            # SAR can't be above previous two lows
-            new_sar = min(new_sar, prev.low)
-            if len(candles) >= 3:
-                new_sar = min(new_sar, candles[-3].low)
-
-            # Check for reversal
-            if current.low < new_sar:
-                # Reverse to short
-                self._is_long = False
-                new_sar = self._ep
-                self._ep = current.low
-                self._af = self.af_start
-            else:
-                # Update EP if new high
-                if current.high > self._ep:
-                    self._ep = current.high
-                    self._af = min(self._af + self.af_start, self.af_max)
+        k = _find_timestamp(timestamps, self._last_ts) if self._initialized else None
+        if k is None or k < 2 or k > last:
+            series = candles if isinstance(candles, CandleSeries) else CandleSeries.from_candles(candles)
+            self._sar, self._ep, self._af, self._is_long = _sar_bulk(
+                series.high[:-1], series.low[:-1], series.close[:-1],
+                self.af_start, self.af_max
+            )
+            self._initialized = True
         else:
-            # Short trend
-            # SAR can't be below previous two highs
-            new_sar = max(new_sar, prev.high)
-            if len(candles) >= 3:
-                new_sar = max(new_sar, candles[-3].high)
-
-            # Check for reversal
-            if current.high > new_sar:
-                # Reverse to long
-                self._is_long = True
-                new_sar = self._ep
-                self._ep = current.high
-                self._af = self.af_start
-            else:
-                # Update EP if new low
-                if current.low < self._ep:
-                    self._ep = current.low
-                    self._af = min(self._af + self.af_start, self.af_max)
-
-        self._sar = new_sar
-        self._last_value = new_sar
-        return new_sar
-
-    def _initialize(self, candles: List[Candle]):
-        """Initialize SAR with first few candles"""
+            high = cols.high
+            low = cols.low
+            sar, ep, af, is_long = self._sar, self._ep, self._af, self._is_long
+            af_start, af_max = self.af_start, self.af_max
+            for i in range(k + 1, last + 1):
+                sar, ep, af, is_long = _sar_step(
+                    high[i], low[i], high[i - 1], low[i - 1], high[i - 2], low[i - 2],
+                    sar, ep, af, is_long, af_start, af_max
+                )
+            self._sar, self._ep, self._af, self._is_long = sar, ep, af, is_long
+
+        self._last_ts = timestamps[last]
+        self._last_value = self._sar
+        return self._sar
+
+    def calculate_bulk(self, candles: Candles) -> float:
+        """
+        SAR holatini butun tarix bo'yicha qayta qurish
+
+        calculate() birinchi chaqiruvda faqat 5 ta candle bilan boshlaydi;
+        bu metod esa barcha candlelarni bitta o'tishda yuradi va holatni
+        oxirgi candle ga moslaydi. Keyingi yangilanishlar - calculate().
+
+        Args:
+            candles: Candle ro'yxati yoki CandleSeries (eng yangisi oxirida)
+
+        Returns:
+            SAR qiymati
+        """
         if len(candles) < 5:
-            self._last_value = candles[-1].low
+            return self.calculate(candles)
+
+        series = candles if isinstance(candles, CandleSeries) else CandleSeries.from_candles(candles)
+        self._sar, self._ep, self._af, self._is_long = _sar_bulk(
+            series.high, series.low, series.close, self.af_start, self.af_max
+        )
+        self._initialized = True
+        self._last_value = self._sar
+        return self._sar
+
+    def _initialize(self, cols):
+        """Initialize SAR with first few candles"""
+        if len(cols.low) < 5:
+            self._last_value = cols.low[-1]
             return
 
         # Find initial trend by comparing first and last prices
-        first_few = candles[:5]
-        if first_few[-1].close > first_few[0].close:
+        if cols.close[4] > cols.close[0]:
             # Uptrend
             self._is_long = True
-            self._sar = min(c.low for c in first_few)
-            self._ep = max(c.high for c in first_few)
+            self._sar = min(cols.low[:5])
+            self._ep = max(cols.high[:5])
         else:
             # Downtrend
             self._is_long = False
-            self._sar = max(c.high for c in first_few)
-            self._ep = min(c.low for c in first_few)
+            self._sar = max(cols.high[:5])
+            self._ep = min(cols.low[:5])
 
         self._af = self.af_start
         self._initialized = True
@@ -273,13 +712,28 @@ class ParabolicSARIndicator:
 #                               CCI INDICATOR
 # ═══════════════════════════════════════════════════════════════════════════════
 
+@njit(cache=True)
+def _abs_dev_sum(values, center: float) -> float:
+    """Sum |x - center| (numba bo'lsa - kompilyatsiya qilingan)"""
+    total = 0.0
+    for x in values:
+        d = x - center
+        total += d if d >= 0.0 else -d
+    return total
+
+
 class CCIIndicator:
     """
     Commodity Channel Index (CCI)
 
     MQL4 dan: iCCI(Symbol(), 0, cciperiod, PRICE_TYPICAL, 0)
+
+    Typical price lar ring buffer da, SMA running sum dan O(1) olinadi.
     """
 
+    # CCI tarixi (ring buffer) hajmi
+    HISTORY_SIZE = 100
+
     def __init__(self, period: int = 14):
         """
         Args:
@@ -287,7 +741,22 @@ class CCIIndicator:
         """
         self.period = period
         self._last_value: float = 0.0
-        self._history: List[float] = []
+        # Bo'lish o'rniga ko'paytirish uchun teskari konstantalar
+        self._inv_period: float = 1.0 / period
+        self._inv_015: float = 1.0 / 0.015
+        # CCI tarixi - boxing siz array ring buffer; _h_i - keyingi yoziladigan
+        # joy, _h_len - to'ldirilgan elementlar soni (<= HISTORY_SIZE)
+        self._history = array('d', [0.0] * self.HISTORY_SIZE)
+        self._h_i: int = 0
+        self._h_len: int = 0
+
+        # Typical price ring buffer (idx - eng eski element, idx-1 - eng yangisi)
+        self._buf = array('d', [0.0] * period)
+        self._idx: int = 0
+        self._running_sum: float = 0.0
+        self._last_ts: Optional[int] = None
+        self._updates: int = 0
+        self._warned: bool = False
 
     @property
     def value(self) -> float:
@@ -297,64 +766,121 @@ class CCIIndicator:
     @property
     def previous(self) -> float:
         """Oldingi CCI qiymati"""
-        if len(self._history) >= 2:
-            return self._history[-2]
+        if self._h_len >= 2:
+            return self._history[self._h_i - 2]
         return 0.0
 
     def save_state(self) -> dict:
         """Indikator holatini saqlash (M6 fix)"""
         return {
             "last_value": self._last_value,
-            "history": self._history[-50:]  # Oxirgi 50 ta qiymat
+            # Oxirgi 50 ta qiymat (eskidan yangiga)
+            "history": self._recent(50)
         }
 
     def load_state(self, state: dict):
         """Indikator holatini yuklash (M6 fix)"""
         self._last_value = state.get("last_value", 0.0)
-        self._history = state.get("history", [])
+        history = state.get("history", [])[-self.HISTORY_SIZE:]
+        self._history = array('d', [0.0] * self.HISTORY_SIZE)
+        self._history[:len(history)] = array('d', history)
+        self._h_len = len(history)
+        self._h_i = self._h_len % self.HISTORY_SIZE
 
-    def calculate(self, candles: List[Candle]) -> float:
+    def calculate(self, candles: Candles) -> float:
         """
         CCI ni hisoblash
 
         CCI = (TP - SMA(TP)) / (0.015 * Mean Deviation)
 
         Args:
-            candles: Candle ro'yxati
+            candles: Candle ro'yxati yoki CandleSeries
 
         Returns:
             CCI qiymati
         """
-        if len(candles) < self.period:
-            logger.warning(f"CCI: Not enough candles ({len(candles)} < {self.period})")
+        n = len(candles)
+        if n < self.period:
+            # Warm-up paytida har tickda emas, bir marta ogohlantirish
+            if not self._warned:
+                self._warned = True
+                logger.warning("CCI: Not enough candles (%d < %d)", n, self.period)
             return 0.0
+        self._warned = False
 
-        # Oxirgi N ta typical price
-        recent = candles[-self.period:]
-        typical_prices = [c.get_typical_price() for c in recent]
+        cols = _as_columns(candles)
+        timestamps = cols.timestamp
+        typical = cols.typical
 
-        # SMA of typical prices
-        sma = sum(typical_prices) / len(typical_prices)
+        k = _find_timestamp(timestamps, self._last_ts)
+        if (k is None or self._updates >= RESEED_INTERVAL
+                or n - 1 - k >= self.period):
+            self._seed(typical, n)
+        else:
+            self._replace_last(typical[k])
+            for i in range(k + 1, n):
+                self._push(typical[i])
+        self._last_ts = timestamps[-1]
+
+        inv_period = self._inv_period
+
+        # SMA of typical prices (running sum)
+        sma = self._running_sum * inv_period
 
         # Mean Deviation
-        mean_dev = sum(abs(tp - sma) for tp in typical_prices) / len(typical_prices)
+        mean_dev = _abs_dev_sum(self._buf, sma) * inv_period
 
         # CCI
         if mean_dev == 0:
             cci = 0.0
         else:
-            current_tp = typical_prices[-1]
-            cci = (current_tp - sma) / (0.015 * mean_dev)
+            current_tp = self._buf[self._idx - 1]
+            cci = (current_tp - sma) * self._inv_015 / mean_dev
 
         self._last_value = cci
 
-        # Keep history
-        self._history.append(cci)
-        if len(self._history) > 100:
-            self._history = self._history[-100:]
+        # Keep history (ring buffer - eng eski qiymat ustiga yoziladi)
+        h_i = self._h_i
+        self._history[h_i] = cci
+        self._h_i = (h_i + 1) % self.HISTORY_SIZE
+        if self._h_len < self.HISTORY_SIZE:
+            self._h_len += 1
 
         return cci
 
+    def _recent(self, count: int) -> List[float]:
+        """Oxirgi count ta CCI qiymati (eskidan yangiga)"""
+        count = min(count, self._h_len)
+        start = self._h_i - count
+        if start >= 0:
+            return self._history[start:self._h_i].tolist()
+        return self._history[start:].tolist() + self._history[:self._h_i].tolist()
+
+    def _push(self, tp: float):
+        """Yangi typical price qo'shish - eng eskisi o'rniga yoziladi"""
+        idx = self._idx
+        self._running_sum += tp - self._buf[idx]
+        self._buf[idx] = tp
+        self._idx = (idx + 1) % self.period
+        self._updates += 1
+
+    def _replace_last(self, tp: float):
+        """Eng yangi typical price ni almashtirish (joriy candle yangilandi)"""
+        pos = self._idx - 1   # -1 -> oxirgi element (array manfiy indeksni qo'llaydi)
+        self._running_sum += tp - self._buf[pos]
+        self._buf[pos] = tp
+        self._updates += 1
+
+    def _seed(self, typical: Sequence[float], n: int):
+        """Bufferni oxirgi N ta typical price dan to'liq to'ldirish (slice nusxasiz)"""
+        buf = self._buf
+        start = n - self.period
+        for i in range(self.period):
+            buf[i] = typical[start + i]
+        self._idx = 0
+        self._running_sum = sum(self._buf)
+        self._updates = 0
+
     def is_above(self, level: float) -> bool:
         """CCI level ustidami?"""
         return self._last_value > level
@@ -365,12 +891,14 @@ class CCIIndicator:
 
     def crossed_above(self, level: float) -> bool:
         """CCI level dan yuqoriga o'tdimi?"""
-        if len(self._history) < 2:
+        if self._h_len < 2:
             return False
-        return self._history[-2] <= level < self._history[-1]
+        h_i = self._h_i
+        return self._history[h_i - 2] <= level < self._history[h_i - 1]
 
     def crossed_below(self, level: float) -> bool:
         """CCI level dan pastga o'tdimi?"""
-        if len(self._history) < 2:
+        if self._h_len < 2:
             return False
-        return self._history[-2] >= level > self._history[-1]
+        h_i = self._h_i
+        return self._history[h_i - 2] >= level > self._history[h_i - 1]
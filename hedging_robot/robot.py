@@ -5,34 +5,70 @@ Main trading loop va state management
 """
 
 import asyncio
+import itertools
 import logging
+import sys
 import time
+from itertools import islice
+from operator import gt, lt
 from typing import Optional, List, Dict
 from datetime import datetime
 from enum import Enum
 
-from .config import RobotConfig
+from .config import RobotConfig, Timeframe
 from .api_client import BitgetClient, BitgetAPIError
 from .strategy import HedgingStrategy, HedgingPosition
-from .indicators import Candle
+from .indicators import CandleSeries
 
 logger = logging.getLogger(__name__)
 
+# WebSocket narxi shuncha soniya yangilanmasa - REST ga qaytiladi
+STREAM_STALE_AFTER = 5.0
+# Qayta ulanish kutishi (2**attempt, shu chegaragacha)
+STREAM_RECONNECT_MAX = 30.0
+
+# Status qatori terminalga ko'pi bilan shuncha soniyada bir marta yoziladi
+STATUS_WRITE_INTERVAL = 1.0
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #                               CANDLE CACHE (M7)
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _parse_timeframe(timeframe: str) -> Optional[Timeframe]:
+    """Bitget granularity -> Timeframe (noma'lum bo'lsa None)"""
+    try:
+        return Timeframe(timeframe)
+    except ValueError:
+        return None
+
+
 class CandleCache:
     """
     Candle caching - API so'rovlarini kamaytirish uchun (M7 fix)
+
+    Candlelar CandleSeries ustunlarida (typed array, Candle obyektlarisiz),
+    timestamp bo'yicha o'sish tartibida saqlanadi (invariant) - yangilanish
+    oxirgi qator ustiga, yangi candle o'ngdan append.
+
+    Yangilanish TTL bo'yicha emas, sham chegarasi bo'yicha: joriy sham
+    yopilguncha REST so'rov yo'q, shakllanayotgan sham narx bilan
+    yangilanadi (update_price).
     """
 
     def __init__(self, max_size: int = 200):
-        self.candles: List[Candle] = []
+        self.candles = CandleSeries()
         self.max_size = max_size
         self.last_fetch_time: float = 0
-        self._cache_duration: float = 1.0  # 1 soniya
+        self._cache_duration: float = 1.0  # 1 soniya (noma'lum timeframe uchun)
+        # Oxirgi candle yopiladigan vaqt (ms) - shungacha REST so'rov kerak emas
+        self._next_bar_close: int = 0
+        # WebSocket candle push ulangan - cache o'zi yangilanadi, REST kerak emas
+        self.streaming: bool = False
+        # Har o'zgarishda oshadi - tail() nusxasi faqat o'zgarganda yangilanadi
+        self._version: int = 0
+        self._tail_key: tuple = (None, 0)
+        self._tail_series = CandleSeries()
         # G7 fix - Race condition uchun lock
         self._lock = asyncio.Lock()
 
@@ -42,7 +78,7 @@ class CandleCache:
         symbol: str,
         timeframe: str,
         count: int = 100
-    ) -> List[Candle]:
+    ) -> CandleSeries:
         """
         Candle ma'lumotlarini olish (caching bilan)
 
@@ -53,68 +89,162 @@ class CandleCache:
             count: Kerakli candle soni
 
         Returns:
-            Candle ro'yxati
+            Oxirgi count ta candle (CandleSeries)
         """
+        # WS push ishlayapti va REST bootstrap bo'lgan - cache authoritative
+        if self.streaming and self.last_fetch_time:
+            return self.tail(count)
+
         # G7 fix - Lock bilan race condition oldini olish
         async with self._lock:
             now = time.time()
-
-            # Agar cache yangi bo'lsa, faqat oxirgi 5 ta candle ni yangilash
-            if self.candles and (now - self.last_fetch_time) < self._cache_duration:
-                return self.candles[-count:]
+            tf = _parse_timeframe(timeframe)
+
+            # Joriy sham hali yopilmagan - network so'rovsiz
+            if self.candles:
+                if tf is not None:
+                    if now * 1000 < self._next_bar_close:
+                        return self.tail(count)
+                elif (now - self.last_fetch_time) < self._cache_duration:
+                    return self.tail(count)
+
+            # To'liq yuklash - butun sham o'tkazib yuborilgan bo'lsa. Sham vaqti
+            # bo'yicha: kutilgan chegaradan keyin yana bir sham ham yopilgan
+            if not self.candles:
+                full_reload = True
+            elif tf is not None:
+                full_reload = now * 1000 >= self._next_bar_close + tf.ms
+            else:
+                full_reload = (now - self.last_fetch_time) > 60
 
             try:
                 # Agar cache bo'sh yoki juda eski bo'lsa - to'liq yuklash
-                if not self.candles or (now - self.last_fetch_time) > 60:
+                if full_reload:
                     candle_data = await client.get_candles(
                         symbol=symbol,
                         granularity=timeframe,
                         limit=count
                     )
-                    self.candles = [Candle.from_bitget(c) for c in candle_data]
+                    self.candles = CandleSeries()
+                    self._merge_candles(_sorted_series(candle_data))
                 else:
-                    # Faqat oxirgi 5 ta candle ni yangilash
+                    # Sham chegarasi - yopilgan va yangi shamni olish
                     candle_data = await client.get_candles(
                         symbol=symbol,
                         granularity=timeframe,
-                        limit=5
+                        limit=2
                     )
-                    self._merge_candles([Candle.from_bitget(c) for c in candle_data])
+                    self._merge_candles(CandleSeries.from_bitget(candle_data))
 
                 self.last_fetch_time = now
+                # Exchange yangi shamni hali bermagan bo'lsa, chegara o'tmishda
+                # qoladi va keyingi tickda qayta so'raladi
+                if tf is not None and self.candles:
+                    self._next_bar_close = self.candles.timestamp[-1] + tf.ms
 
             except Exception as e:
                 logger.warning(f"Candle fetch failed, using cache: {e}")
 
-            # Timestamp bo'yicha saralash
-            self.candles.sort(key=lambda c: c.timestamp)
+            return self.tail(count)
+
+    def update_price(self, price: float) -> bool:
+        """
+        Shakllanayotgan (oxirgi) shamni joriy narx bilan yangilash
+
+        WS candle push bo'lsa kerak emas - u authoritative.
+
+        Returns:
+            True agar oxirgi sham o'zgargan bo'lsa
+        """
+        candles = self.candles
+        if self.streaming or not candles or price <= 0:
+            return False
+        high = candles.high[-1]
+        low = candles.low[-1]
+        if price == candles.close[-1] and low <= price <= high:
+            return False
+        candles.set(
+            -1, candles.timestamp[-1], candles.open[-1],
+            high if high > price else price,
+            low if low < price else price,
+            price, candles.volume[-1]
+        )
+        self._version += 1
+        return True
+
+    def tail(self, count: int) -> CandleSeries:
+        """Oxirgi count ta candle (eskidan yangiga)"""
+        key = (self._version, count)
+        if key != self._tail_key:
+            self._tail_series = self.candles.tail(count)
+            self._tail_key = key
+        return self._tail_series
 
-            return self.candles[-count:]
+    def apply_stream(self, candle_data: List[List]):
+        """WebSocket candle push ni cache ga qo'shish (eskidan yangiga)"""
+        self._merge_candles(CandleSeries.from_bitget(candle_data))
 
-    def _merge_candles(self, new_candles: List[Candle]):
+    def _merge_candles(self, new_candles: CandleSeries):
         """Yangi candlelarni cache ga qo'shish"""
         # N8 fix - Bo'sh ro'yxat kelsa, ignore qilish
         if not new_candles:
             logger.debug("Empty candle list received, skipping merge")
             return
 
-        # Timestamp bo'yicha dict yaratish (tez qidirish uchun)
-        existing_map = {c.timestamp: i for i, c in enumerate(self.candles)}
-
-        for candle in new_candles:
-            if candle.timestamp in existing_map:
-                # Mavjud candleni yangilash (joriy candle uchun)
-                idx = existing_map[candle.timestamp]
-                self.candles[idx] = candle
+        candles = self.candles
+        timestamps = candles.timestamp
+
+        # Eng ko'p uchraydigan holat - hammasi yangi (overlap yo'q) va o'sish
+        # tartibida: butun ustunlar bitta extend bilan, qatorma-qator yurmasdan
+        new_ts = new_candles.timestamp
+        if ((not timestamps or new_ts[0] > timestamps[-1])
+                and all(map(lt, new_ts, islice(new_ts, 1, None)))):
+            candles.extend(new_candles)
+            new_candles = CandleSeries()
+
+        # Overlap faqat oxirgi bir necha qatorda bo'lishi mumkin
+        window = max(len(new_candles) + 2, 10)
+        for j in range(len(new_candles)):
+            row = new_candles.row(j)
+            ts = row[0]
+            if not timestamps or ts > timestamps[-1]:
+                # Yangi candle - o'ngdan qo'shish
+                candles.append(*row)
+            elif ts == timestamps[-1]:
+                # Joriy candle yangilandi
+                candles.set(-1, *row)
             else:
-                # Yangi candle qo'shish
-                self.candles.append(candle)
-                existing_map[candle.timestamp] = len(self.candles) - 1
+                # Oldingi (yopilgan) candle - faqat oxirgi `window` qator ichida
+                # o'ngdan orqaga qidirish; undan eskisi kutilmagan - tashlanadi
+                for i in range(len(timestamps) - 2, max(-1, len(timestamps) - 1 - window), -1):
+                    existing = timestamps[i]
+                    if existing == ts:
+                        candles.set(i, *row)
+                        break
+                    if existing < ts:
+                        break
+                else:
+                    logger.debug(f"Stale candle {ts} outside merge window, dropped")
+
+        # Hajmni cheklash - eng eskilari chapdan olib tashlanadi
+        excess = len(candles) - self.max_size
+        if excess > 0:
+            candles.drop_front(excess)
+        self._version += 1
+
 
-        # Hajmni cheklash (timestamp bo'yicha eng yangisini saqlash)
-        if len(self.candles) > self.max_size:
-            self.candles.sort(key=lambda c: c.timestamp)
-            self.candles = self.candles[-self.max_size:]
+def _sorted_series(candle_data: List[List]) -> CandleSeries:
+    """REST javobidan CandleSeries (tartib buzilgan bo'lsa - saralab)"""
+    series = CandleSeries.from_bitget(candle_data)
+    ts = series.timestamp
+    # Bitget eskidan yangiga qaytaradi - odatda bitta O(n) tekshiruv bilan tugaydi
+    if all(map(lt, ts, islice(ts, 1, None))):
+        return series
+    if all(map(gt, ts, islice(ts, 1, None))):
+        # Teskari tartib - saralash o'rniga ag'darish
+        return CandleSeries.from_bitget(candle_data[::-1])
+    # Xom satrlarni saralab qayta parse - Candle obyektlari yaratilmaydi
+    return CandleSeries.from_bitget(sorted(candle_data, key=lambda row: int(row[0])))
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -156,7 +286,7 @@ class HedgingRobot:
         # Market data
         self.current_price: float = 0.0
         self.balance: float = 0.0
-        self.candles: List[Candle] = []
+        self.candles = CandleSeries()
 
         # Candle cache (M7 fix)
         self._candle_cache = CandleCache(max_size=200)
@@ -165,12 +295,61 @@ class HedgingRobot:
         self.start_time: Optional[datetime] = None
         self.tick_count: int = 0
         self.last_bar_time: int = 0
+        # Oxirgi position sync dan beri order ochildi/yopildi (True - birinchi sync)
+        self._positions_dirty: bool = True
+        # Exchange orderId qaytarmasa - lokal ID lar (noyob, monoton)
+        self._oid_counter = itertools.count(int(time.time() * 1000))
 
         # Flags
         self._running: bool = False
 
-        # N2 fix - Race condition uchun lock
-        self._order_lock = asyncio.Lock()
+        # Savdo vaqti oynasi - daqiqalarda, bir marta hisoblanadi (TimeConfig o'zgarmas)
+        time_cfg = config.time
+        self._trading_is_24h: bool = time_cfg.is_24h()
+        self._trading_start: int = time_cfg.START_HOUR * 60 + time_cfg.START_MINUTE
+        self._trading_finish: int = time_cfg.FINISH_HOUR * 60 + time_cfg.FINISH_MINUTE
+        self._trading_overnight: bool = self._trading_start > self._trading_finish
+
+        # Tez-tez o'qiladigan sozlamalar - bir marta bog'lanadi (sub-configlar o'zgarmas)
+        self._sym: str = config.trading.SYMBOL
+        self._lev: int = config.trading.LEVERAGE
+        self._min_lot: float = config.money.MIN_LOT
+        self._max_lot: float = config.money.MAX_LOT
+        self._base_lot: float = config.money.BASE_LOT
+        self._tick_interval: float = config.TICK_INTERVAL
+        self._open_on_new_candle: bool = config.OPEN_ON_NEW_CANDLE
+
+        # Davriy ishlar - tick sonidan emas, monotonic soat bo'yicha (start() da boshlanadi)
+        self._balance_period: float = config.TICK_INTERVAL * 5
+        self._position_sync_period: float = config.TICK_INTERVAL * 10
+        self._status_period: float = config.TICK_INTERVAL * 10
+        self._next_balance_refresh: float = 0.0
+        self._next_position_sync: float = 0.0
+        self._next_status: float = 0.0
+
+        # WebSocket market stream (USE_WEBSOCKET)
+        self._stream_task: Optional[asyncio.Task] = None
+        self._stream_price: float = 0.0
+        self._stream_price_time: float = 0.0  # monotonic
+
+        # Status qatori - tick loop faqat navbatga qo'yadi, yozish alohida taskda
+        self._status_queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._status_task: Optional[asyncio.Task] = None
+        self._last_status_counts: tuple = (0, 0)
+        # get_status cache - (kalit, status dict)
+        self._status_cache: tuple = (None, {})
+        # Status dagi config qismi o'zgarmaydi - bir marta quriladi
+        self._status_config: Dict = {
+            "multiplier": config.grid.MULTIPLIER,
+            "space_percent": config.grid.SPACE_PERCENT,
+            "single_order_profit": config.profit.SINGLE_ORDER_PROFIT,
+            "pair_global_profit": config.profit.PAIR_GLOBAL_PROFIT
+        }
+
+        # N2 fix - Race condition uchun lock (tomonlar alohida - BUY va SELL
+        # bir-birini kutmaydi; position sync ikkalasini ham oladi)
+        self._buy_lock = asyncio.Lock()
+        self._sell_lock = asyncio.Lock()
 
     # ─────────────────────────────────────────────────────────────────────────
     #                           LIFECYCLE METHODS
@@ -204,13 +383,16 @@ class HedgingRobot:
 
             # Set leverage
             await self.client.set_leverage(
-                symbol=self.config.trading.SYMBOL,
-                leverage=self.config.trading.LEVERAGE
+                symbol=self._sym,
+                leverage=self._lev
             )
-            logger.info(f"Leverage set to {self.config.trading.LEVERAGE}x")
+            logger.info(f"Leverage set to {self._lev}x")
 
         except BitgetAPIError as e:
             logger.error(f"API error: {e}")
+            # Session ochiq qolmasin - keyingi start() yangi client yaratadi
+            await self.client.close()
+            self.client = None
             self.state = RobotState.ERROR
             return False
 
@@ -235,13 +417,24 @@ class HedgingRobot:
         self._running = True
         self.start_time = datetime.utcnow()
         self.tick_count = 0
+        now = time.monotonic()
+        self._next_balance_refresh = now + self._balance_period
+        self._next_position_sync = now + self._position_sync_period
+        self._next_status = now + self._status_period
 
-        logger.info(f"Robot started. Trading {self.config.trading.SYMBOL}")
+        logger.info(f"Robot started. Trading {self._sym}")
+
+        if self.config.USE_WEBSOCKET:
+            self._stream_task = asyncio.create_task(self._market_stream())
+        self._status_task = asyncio.create_task(self._status_writer())
 
         try:
+            tick = self._tick
+            sleep = asyncio.sleep
+            interval = self._tick_interval
             while self._running:
-                await self._tick()
-                await asyncio.sleep(self.config.TICK_INTERVAL)
+                await tick()
+                await sleep(interval)
 
         except asyncio.CancelledError:
             logger.info("Robot cancelled")
@@ -262,6 +455,25 @@ class HedgingRobot:
         self.state = RobotState.STOPPING
         self._running = False
 
+        # Market stream ni to'xtatish
+        if self._stream_task:
+            self._stream_task.cancel()
+            try:
+                await self._stream_task
+            except asyncio.CancelledError:
+                pass
+            self._stream_task = None
+        self._candle_cache.streaming = False
+
+        # Status writer ni to'xtatish
+        if self._status_task:
+            self._status_task.cancel()
+            try:
+                await self._status_task
+            except asyncio.CancelledError:
+                pass
+            self._status_task = None
+
         # Close all positions
         if self.strategy and (self.strategy.buy_positions or self.strategy.sell_positions):
             logger.info("Closing all positions...")
@@ -294,6 +506,7 @@ class HedgingRobot:
         6. Grid qo'shimchalar tekshiriladi
         """
         self.tick_count += 1
+        strategy = self.strategy
 
         try:
             # 1. Update market data
@@ -302,21 +515,25 @@ class HedgingRobot:
             # 2. Check if new bar
             is_new_bar = self._is_new_bar()
 
-            # 3. Update indicators
-            self.strategy.update_indicators(self.candles)
+            # 3. Update indicators - to'liq faqat yangi shamda, qolgan
+            # ticklarda faqat shakllanayotgan sham (SAR qadam tashlamaydi)
+            if is_new_bar:
+                strategy.update_indicators(self.candles)
+            else:
+                strategy.update_live(self.candles)
 
             # 4. Check global limits
-            should_stop, reason = self.strategy.check_global_limits(
+            should_stop, reason = strategy.check_global_limits(
                 self.current_price,
-                self.config.trading.LEVERAGE
+                self._lev
             )
             if should_stop:
                 logger.warning(f"Global limit hit: {reason}")
                 await self._close_all_positions()
-                self.strategy.stop_trading()
+                strategy.stop_trading()
                 return
 
-            if self.strategy.should_stop_trading():
+            if strategy.should_stop_trading():
                 return
 
             # 5. Check profit taking
@@ -327,17 +544,21 @@ class HedgingRobot:
                 return
 
             # 7. Check entry signals (only on new bar)
-            self.strategy.check_entry_signals(is_new_bar)
+            strategy.check_entry_signals(is_new_bar)
 
             # 8. Open initial orders
             await self._check_initial_orders()
 
             # 9. Check grid additions
-            if not self.config.OPEN_ON_NEW_CANDLE or is_new_bar:
+            if not self._open_on_new_candle or is_new_bar:
                 await self._check_grid_additions()
 
-            # 10. Display status
-            if self.tick_count % 10 == 0:  # Every 10 ticks
+            # 10. Display status - davriy, pozitsiyalar o'zgarsa darhol
+            counts = (len(strategy.buy_positions), len(strategy.sell_positions))
+            now = time.monotonic()
+            if counts != self._last_status_counts or now >= self._next_status:
+                self._last_status_counts = counts
+                self._next_status = now + self._status_period
                 self._display_status()
 
         except BitgetAPIError as e:
@@ -346,32 +567,116 @@ class HedgingRobot:
             logger.error(f"Error in tick: {e}", exc_info=True)
 
     async def _update_market_data(self):
-        """Market ma'lumotlarini yangilash"""
-        # Get current price
-        self.current_price = await self.client.get_price(self.config.trading.SYMBOL)
+        """
+        Market ma'lumotlarini yangilash
+
+        Mustaqil so'rovlar parallel yuboriladi - tick vaqti RTT lar
+        yig'indisi emas, eng sekinining RTT si.
+        """
+        symbol = self._sym
+        tasks = {}
+        now = time.monotonic()
+
+        # Get current price (WS push yangi bo'lsa - network so'rovsiz)
+        if now - self._stream_price_time < STREAM_STALE_AFTER:
+            self.current_price = self._stream_price
+        else:
+            tasks["price"] = self.client.get_price(symbol)
 
         # Get candles (M7 fix - caching bilan)
-        self.candles = await self._candle_cache.get_candles(
+        tasks["candles"] = self._candle_cache.get_candles(
             client=self.client,
-            symbol=self.config.trading.SYMBOL,
+            symbol=symbol,
             timeframe=self.config.entry.TIMEFRAME,
             count=100
         )
 
-        # Update balance periodically (har 5 tickda - M3 fix)
-        if self.tick_count % 5 == 0:
-            self.balance = await self.client.get_balance()
+        # Update balance periodically (~5 tick - M3 fix)
+        if now >= self._next_balance_refresh:
+            self._next_balance_refresh = now + self._balance_period
+            tasks["balance"] = self.client.get_balance()
+
+        # Position sync (~10 tick) - exchange dan olish parallel,
+        # strategy ga qo'llash esa yangi narx bilan keyin. Pozitsiya yo'q va
+        # oxirgi sync dan beri order bo'lmagan - so'rash shart emas
+        if now >= self._next_position_sync:
+            self._next_position_sync = now + self._position_sync_period
+            if (self._positions_dirty
+                    or self.strategy.buy_positions
+                    or self.strategy.sell_positions):
+                tasks["positions"] = self.client.get_positions(symbol=symbol)
+
+        results = dict(zip(tasks, await asyncio.gather(*tasks.values(), return_exceptions=True)))
+
+        price = results.get("price")
+        if price is not None and not isinstance(price, BaseException):
+            self.current_price = price
+        candles = results["candles"]
+        if not isinstance(candles, BaseException):
+            self.candles = candles
+        balance = results.get("balance")
+        if balance is not None and not isinstance(balance, BaseException):
+            self.balance = balance
+
+        # Candle cache sham chegarasigacha REST so'ramaydi - oxirgi sham narx bilan
+        if self._candle_cache.update_price(self.current_price):
+            self.candles = self._candle_cache.tail(100)
+
+        positions = results.get("positions")
+        if isinstance(positions, BaseException):
+            logger.warning(f"Position sync failed: {positions}")
+        elif positions is not None:
+            await self._sync_positions(positions)
+
+        # Oldingidek - narx/candle/balance xatosi tickni to'xtatadi
+        for key in ("price", "candles", "balance"):
+            if isinstance(results.get(key), BaseException):
+                raise results[key]
+
+    async def _market_stream(self):
+        """
+        Bitget public WebSocket - ticker va candle push
+
+        Narx va candlelar push orqali yangilanadi, tick loop faqat cache ni
+        o'qiydi. Ulanish uzilsa REST polling ga qaytiladi va qayta ulanadi.
+        """
+        symbol = self._sym
+        channels = [
+            {"instType": "USDT-FUTURES", "channel": "ticker", "instId": symbol},
+            {"instType": "USDT-FUTURES", "channel": f"candle{self.config.entry.TIMEFRAME}", "instId": symbol},
+        ]
+        attempt = 0
+
+        while self._running:
+            try:
+                async for msg in self.client.stream_public(channels):
+                    attempt = 0
+                    data = msg["data"]
+                    if msg["arg"]["channel"] == "ticker":
+                        self._stream_price = float(data[0]["lastPr"])
+                        self._stream_price_time = time.monotonic()
+                    else:
+                        self._candle_cache.apply_stream(data)
+                        self._candle_cache.streaming = True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Market stream error: {e}")
 
-        # Position sync (har 10 tickda)
-        if self.tick_count % 10 == 0:
-            await self._sync_positions()
+            # Uzildi - REST ga qaytish
+            self._candle_cache.streaming = False
+            self._stream_price_time = 0.0
+
+            if self._running:
+                await asyncio.sleep(min(STREAM_RECONNECT_MAX, 2 ** attempt))
+                attempt += 1
 
     def _is_new_bar(self) -> bool:
         """Yangi sham ochildimi?"""
         if not self.candles:
             return False
 
-        current_time = self.candles[-1].timestamp
+        current_time = self.candles.timestamp[-1]
         if current_time > self.last_bar_time:
             self.last_bar_time = current_time
             return True
@@ -379,28 +684,17 @@ class HedgingRobot:
 
     def _check_trading_time(self) -> bool:
         """Savdo vaqtidamizmi?"""
-        if self.config.time.is_24h():
+        if self._trading_is_24h:
             return True
 
-        now = datetime.utcnow()
-        hour = now.hour
-        minute = now.minute
-
-        start_h = self.config.time.START_HOUR
-        start_m = self.config.time.START_MINUTE
-        finish_h = self.config.time.FINISH_HOUR
-        finish_m = self.config.time.FINISH_MINUTE
-
-        # Convert to minutes for easier comparison
-        current = hour * 60 + minute
-        start = start_h * 60 + start_m
-        finish = finish_h * 60 + finish_m
+        # UTC kun boshidan daqiqalar (datetime obyekti yaratmasdan)
+        current = int(time.time() // 60) % 1440
 
-        if start <= finish:
-            return start <= current <= finish
+        if not self._trading_overnight:
+            return self._trading_start <= current <= self._trading_finish
         else:
             # Overnight (e.g., 20:00 - 08:00)
-            return current >= start or current <= finish
+            return current >= self._trading_start or current <= self._trading_finish
 
     # ─────────────────────────────────────────────────────────────────────────
     #                           PROFIT TAKING
@@ -408,7 +702,7 @@ class HedgingRobot:
 
     async def _check_profit_taking(self):
         """Profit taking tekshirish"""
-        leverage = self.config.trading.LEVERAGE
+        leverage = self._lev
 
         # Single order profit
         should_close, side = self.strategy.check_single_order_profit(
@@ -433,53 +727,64 @@ class HedgingRobot:
     # ─────────────────────────────────────────────────────────────────────────
 
     async def _check_initial_orders(self):
-        """Dastlabki orderlarni tekshirish"""
+        """Dastlabki orderlarni tekshirish
+
+        should_stop_trading() bu yerda qayta tekshirilmaydi - _tick uni
+        tick boshida bir marta tekshirib, True bo'lsa shu yergacha kelmaydi.
+        """
         # Check if can trade today
         if not self.strategy.can_trade_today():
             return
 
-        # N2 fix - Lock bilan race condition oldini olish
-        async with self._order_lock:
-            # BUY initial order
-            if (self.strategy.fire_buy and
-                not self.strategy.buy_positions and
-                not self.strategy.should_stop_trading()):
+        # BUY va SELL parallel - bir vaqtda yuborilgan orderlarni client
+        # bitta batch-place-order requestga yig'adi
+        await asyncio.gather(self._check_initial_buy(), self._check_initial_sell())
 
-                await self._open_buy(self.config.money.BASE_LOT, level=1)
+    async def _check_initial_buy(self):
+        """BUY initial order"""
+        # N2 fix - Lock bilan race condition oldini olish (faqat BUY tomoni)
+        async with self._buy_lock:
+            if self.strategy.fire_buy and not self.strategy.buy_positions:
+                await self._open_buy(self._base_lot, level=1)
                 self.strategy.fire_buy = False
                 self.strategy.increment_today_trades()
 
-            # SELL initial order
-            if (self.strategy.fire_sell and
-                not self.strategy.sell_positions and
-                not self.strategy.should_stop_trading()):
-
-                await self._open_sell(self.config.money.BASE_LOT, level=1)
+    async def _check_initial_sell(self):
+        """SELL initial order"""
+        # N2 fix - Lock bilan race condition oldini olish (faqat SELL tomoni)
+        async with self._sell_lock:
+            if self.strategy.fire_sell and not self.strategy.sell_positions:
+                await self._open_sell(self._base_lot, level=1)
                 self.strategy.fire_sell = False
                 self.strategy.increment_today_trades()
 
     async def _check_grid_additions(self):
-        """Grid orderlarini tekshirish"""
-        # N2 fix - Lock bilan race condition oldini olish
-        async with self._order_lock:
-            # BUY grid
+        """Grid orderlarini tekshirish (BUY va SELL parallel)"""
+        await asyncio.gather(self._check_buy_grid(), self._check_sell_grid())
+
+    async def _check_buy_grid(self):
+        """BUY grid"""
+        async with self._buy_lock:
             should_add, level, lot = self.strategy.should_add_buy_grid(self.current_price)
             if should_add:
                 await self._open_buy(lot, level)
 
-            # SELL grid
+    async def _check_sell_grid(self):
+        """SELL grid"""
+        async with self._sell_lock:
             should_add, level, lot = self.strategy.should_add_sell_grid(self.current_price)
             if should_add:
                 await self._open_sell(lot, level)
 
     async def _open_buy(self, lot: float, level: int):
         """BUY order ochish"""
+        self._positions_dirty = True
         try:
             # Lot limitlarni tekshirish
-            lot = max(self.config.money.MIN_LOT, min(lot, self.config.money.MAX_LOT))
+            lot = max(self._min_lot, min(lot, self._max_lot))
 
             # G8 fix - Balance tekshirish
-            required_margin = (lot * self.current_price) / self.config.trading.LEVERAGE
+            required_margin = (lot * self.current_price) / self._lev
             if self.balance < required_margin * 1.1:  # 10% buffer
                 logger.warning(
                     f"Insufficient balance for BUY: required={required_margin:.2f}, "
@@ -488,11 +793,12 @@ class HedgingRobot:
                 return
 
             result = await self.client.open_long(
-                symbol=self.config.trading.SYMBOL,
+                symbol=self._sym,
                 size=lot
             )
 
-            order_id = result.get("orderId", str(int(time.time() * 1000)))
+            # Fallback faqat orderId bo'lmaganda hisoblanadi
+            order_id = result.get("orderId") or f"local-{next(self._oid_counter)}"
 
             # Add to strategy
             self.strategy.add_position(
@@ -510,12 +816,13 @@ class HedgingRobot:
 
     async def _open_sell(self, lot: float, level: int):
         """SELL order ochish"""
+        self._positions_dirty = True
         try:
             # Lot limitlarni tekshirish
-            lot = max(self.config.money.MIN_LOT, min(lot, self.config.money.MAX_LOT))
+            lot = max(self._min_lot, min(lot, self._max_lot))
 
             # G8 fix - Balance tekshirish
-            required_margin = (lot * self.current_price) / self.config.trading.LEVERAGE
+            required_margin = (lot * self.current_price) / self._lev
             if self.balance < required_margin * 1.1:  # 10% buffer
                 logger.warning(
                     f"Insufficient balance for SELL: required={required_margin:.2f}, "
@@ -524,11 +831,12 @@ class HedgingRobot:
                 return
 
             result = await self.client.open_short(
-                symbol=self.config.trading.SYMBOL,
+                symbol=self._sym,
                 size=lot
             )
 
-            order_id = result.get("orderId", str(int(time.time() * 1000)))
+            # Fallback faqat orderId bo'lmaganda hisoblanadi
+            order_id = result.get("orderId") or f"local-{next(self._oid_counter)}"
 
             # Add to strategy
             self.strategy.add_position(
@@ -549,17 +857,18 @@ class HedgingRobot:
         if not self.strategy.buy_positions:
             return
 
+        self._positions_dirty = True
         total_lots = self.strategy.get_total_buy_lots()
 
         try:
             await self.client.close_long(
-                symbol=self.config.trading.SYMBOL,
+                symbol=self._sym,
                 size=total_lots
             )
 
             pnl, count = self.strategy.close_buy_positions(
                 self.current_price,
-                self.config.trading.LEVERAGE
+                self._lev
             )
 
             logger.info(f"Closed {count} BUY positions. PnL: ${pnl:.2f}")
@@ -580,17 +889,18 @@ class HedgingRobot:
         if not self.strategy.sell_positions:
             return
 
+        self._positions_dirty = True
         total_lots = self.strategy.get_total_sell_lots()
 
         try:
             await self.client.close_short(
-                symbol=self.config.trading.SYMBOL,
+                symbol=self._sym,
                 size=total_lots
             )
 
             pnl, count = self.strategy.close_sell_positions(
                 self.current_price,
-                self.config.trading.LEVERAGE
+                self._lev
             )
 
             logger.info(f"Closed {count} SELL positions. PnL: ${pnl:.2f}")
@@ -607,23 +917,50 @@ class HedgingRobot:
                 self.strategy.fire_sell = False
 
     async def _close_all_positions(self):
-        """Barcha pozitsiyalarni yopish"""
-        await self._close_buy_positions()
-        await self._close_sell_positions()
-
-    async def _sync_positions(self):
-        """Exchange pozitsiyalarini sinxronizatsiya qilish"""
-        # G2 fix - Lock bilan race condition oldini olish
-        async with self._order_lock:
+        """
+        Barcha pozitsiyalarni yopish (BUY va SELL parallel - turli tomonlar)
+
+        Ikkala close order bir vaqtda place_order navbatiga tushadi va bitta
+        batch-place-order requestga yig'iladi (1 RTT). Har bir tomon o'z
+        natijasini (yoki 22002 xatosini) alohida oladi - phantom state
+        tozalash tomon bo'yicha to'g'ri qoladi.
+
+        close-positions (flash close) ishlatilmaydi: u exchange dagi BUTUN
+        pozitsiyani yopadi, lokal lotlar esa undan farq qilishi mumkin.
+        """
+        results = await asyncio.gather(
+            self._close_buy_positions(), self._close_sell_positions(),
+            return_exceptions=True
+        )
+        # Ikkala tomon ham tugaydi, xatolar har biri alohida log qilinadi;
+        # birinchisi oldingidek yuqoriga uzatiladi
+        errors = [r for r in results if isinstance(r, BaseException)]
+        for side, result in zip(("BUY", "SELL"), results):
+            if isinstance(result, BaseException):
+                logger.error(f"Close all: {side} side failed: {result!r}")
+        if errors:
+            raise errors[0]
+
+    async def _sync_positions(self, exchange_positions: Optional[List] = None):
+        """
+        Exchange pozitsiyalarini sinxronizatsiya qilish
+
+        Args:
+            exchange_positions: Oldindan olingan pozitsiyalar (None - API dan olinadi)
+        """
+        # G2 fix - Lock bilan race condition oldini olish (har doim BUY -> SELL tartibida)
+        async with self._buy_lock, self._sell_lock:
             try:
-                exchange_positions = await self.client.get_positions(
-                    symbol=self.config.trading.SYMBOL
-                )
+                if exchange_positions is None:
+                    exchange_positions = await self.client.get_positions(
+                        symbol=self._sym
+                    )
                 await self.strategy.sync_positions_from_exchange(
                     exchange_positions=exchange_positions,
-                    symbol=self.config.trading.SYMBOL,
+                    symbol=self._sym,
                     current_price=self.current_price
                 )
+                self._positions_dirty = False
             except Exception as e:
                 logger.warning(f"Position sync failed: {e}")
 
@@ -635,55 +972,103 @@ class HedgingRobot:
         """Status chiqarish"""
         buy_count = len(self.strategy.buy_positions)
         sell_count = len(self.strategy.sell_positions)
-        buy_pnl = self.strategy.get_buy_pnl(self.current_price, self.config.trading.LEVERAGE)
-        sell_pnl = self.strategy.get_sell_pnl(self.current_price, self.config.trading.LEVERAGE)
+        buy_pnl = self.strategy.get_buy_pnl(self.current_price, self._lev)
+        sell_pnl = self.strategy.get_sell_pnl(self.current_price, self._lev)
         total_pnl = buy_pnl + sell_pnl
 
         sma = self.strategy.sma.value
         sar = self.strategy.sar.value
 
-        print(f"\r[{self.tick_count}] {self.config.trading.SYMBOL}: ${self.current_price:.2f} | "
-              f"SMA: {sma:.2f} SAR: {sar:.2f} | "
-              f"BUY: {buy_count} (${buy_pnl:.2f}) | SELL: {sell_count} (${sell_pnl:.2f}) | "
-              f"Total: ${total_pnl:.2f} | Balance: ${self.balance:.2f}",
-              end="", flush=True)
+        line = (f"\r[{self.tick_count}] {self._sym}: ${self.current_price:.2f} | "
+                f"SMA: {sma:.2f} SAR: {sar:.2f} | "
+                f"BUY: {buy_count} (${buy_pnl:.2f}) | SELL: {sell_count} (${sell_pnl:.2f}) | "
+                f"Total: ${total_pnl:.2f} | Balance: ${self.balance:.2f}")
+
+        # Terminal I/O tick loop da emas - eng oxirgi qator navbatda qoladi
+        try:
+            self._status_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        self._status_queue.put_nowait(line)
+
+    async def _status_writer(self):
+        """Status qatorini yozish (STATUS_WRITE_INTERVAL da bir marta, eng yangisi)"""
+        while True:
+            line = await self._status_queue.get()
+            sys.stdout.write(line)
+            sys.stdout.flush()
+            await asyncio.sleep(STATUS_WRITE_INTERVAL)
 
     # ─────────────────────────────────────────────────────────────────────────
     #                           STATUS METHODS
     # ─────────────────────────────────────────────────────────────────────────
 
     def get_status(self) -> Dict:
-        """Robot statusini olish"""
+        """
+        Robot statusini olish
+
+        Tick, holat, narx, balans va pozitsiyalar soni o'zgarmagan bo'lsa
+        (UI tez-tez so'raganda) status qayta qurilmaydi - faqat uptime yangilanadi.
+        """
+        strategy = self.strategy
+        key = (
+            self.tick_count, self.state, self.current_price, self.balance,
+            len(strategy.buy_positions) if strategy else 0,
+            len(strategy.sell_positions) if strategy else 0
+        )
+        if key == self._status_cache[0]:
+            status = self._status_cache[1]
+        else:
+            status = self._build_status()
+            self._status_cache = (key, status)
+
         uptime = 0
         if self.start_time:
             uptime = int((datetime.utcnow() - self.start_time).total_seconds())
+        return {**status, "uptime": uptime}
+
+    def _build_status(self) -> Dict:
+        """Status dict ni qurish (get_status cache'i uchun)"""
+        strategy = self.strategy
+        price = self.current_price
+        leverage = self._lev
+
+        if strategy:
+            # PnL avval - to_dict() dagi pos.pnl ham shu narx bo'yicha bo'ladi
+            buy_pnl = strategy.get_buy_pnl(price, leverage)
+            sell_pnl = strategy.get_sell_pnl(price, leverage)
+            positions = {
+                "buy": [p.to_dict() for p in strategy.buy_positions],
+                "sell": [p.to_dict() for p in strategy.sell_positions],
+                "buy_count": len(strategy.buy_positions),
+                "sell_count": len(strategy.sell_positions),
+                "buy_pnl": buy_pnl,
+                "sell_pnl": sell_pnl
+            }
+            indicators = {
+                "sma": strategy.sma.value,
+                "sar": strategy.sar.value,
+                "cci": strategy.cci.value if strategy.cci else 0
+            }
+            stats = strategy.get_stats()
+        else:
+            positions = {
+                "buy": [], "sell": [], "buy_count": 0, "sell_count": 0,
+                "buy_pnl": 0, "sell_pnl": 0
+            }
+            indicators = {"sma": 0, "sar": 0, "cci": 0}
+            stats = {}
 
         return {
             "state": self.state.value,
-            "symbol": self.config.trading.SYMBOL,
-            "current_price": self.current_price,
+            "symbol": self._sym,
+            "current_price": price,
             "balance": self.balance,
-            "leverage": self.config.trading.LEVERAGE,
+            "leverage": leverage,
             "tick_count": self.tick_count,
-            "uptime": uptime,
-            "indicators": {
-                "sma": self.strategy.sma.value if self.strategy else 0,
-                "sar": self.strategy.sar.value if self.strategy else 0,
-                "cci": self.strategy.cci.value if self.strategy and self.strategy.cci else 0
-            },
-            "positions": {
-                "buy": [p.to_dict() for p in self.strategy.buy_positions] if self.strategy else [],
-                "sell": [p.to_dict() for p in self.strategy.sell_positions] if self.strategy else [],
-                "buy_count": len(self.strategy.buy_positions) if self.strategy else 0,
-                "sell_count": len(self.strategy.sell_positions) if self.strategy else 0,
-                "buy_pnl": self.strategy.get_buy_pnl(self.current_price, self.config.trading.LEVERAGE) if self.strategy else 0,
-                "sell_pnl": self.strategy.get_sell_pnl(self.current_price, self.config.trading.LEVERAGE) if self.strategy else 0
-            },
-            "stats": self.strategy.get_stats() if self.strategy else {},
-            "config": {
-                "multiplier": self.config.grid.MULTIPLIER,
-                "space_percent": self.config.grid.SPACE_PERCENT,
-                "single_order_profit": self.config.profit.SINGLE_ORDER_PROFIT,
-                "pair_global_profit": self.config.profit.PAIR_GLOBAL_PROFIT
-            }
+            "uptime": 0,
+            "indicators": indicators,
+            "positions": positions,
+            "stats": stats,
+            "config": self._status_config
         }
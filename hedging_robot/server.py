@@ -10,17 +10,37 @@ import logging
 import time
 import hashlib
 import hmac
+import json
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional
 from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, Request, Header
+from fastapi import FastAPI, HTTPException, Request, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 import psutil
 
+from .api_client import close_shared_connectors
 from .session_manager import get_session_manager, SessionStatus
 
+# JSON - orjson bo'lsa tezroq (bytes qaytaradi), bo'lmasa stdlib json
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    orjson = None
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode('utf-8')
+
+# Endpoint javoblari - orjson bo'lsa C encoder orqali, bo'lmasa stdlib json
+DefaultResponse = ORJSONResponse if orjson is not None else JSONResponse
+
 logger = logging.getLogger(__name__)
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -32,8 +52,14 @@ BOT_NAME = os.getenv("BOT_NAME", "Hedging Grid Robot")
 BOT_VERSION = os.getenv("BOT_VERSION", "1.0.0")
 BOT_SECRET = os.getenv("BOT_SECRET", "")
 ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", "")  # M9 fix - Admin auth
+_ADMIN_API_KEY_BYTES = ADMIN_API_KEY.encode("utf-8")
+
+# CORS - vergul bilan ajratilgan dashboard originlari ("*" - hammasi)
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()]
 
 START_TIME = datetime.utcnow()
+# Uptime uchun - soat o'zgarishlariga bog'liq emas, datetime obyekti yaratmaydi
+_START_MONOTONIC = time.monotonic()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -90,6 +116,12 @@ class ErrorResponse(BaseModel):
 
 # G10 fix - Background cleanup task flag
 _cleanup_task: Optional[asyncio.Task] = None
+_cpu_sampler_task: Optional[asyncio.Task] = None
+
+# Jarayon obyekti bir marta - cpu_percent() oldingi chaqiruvga nisbatan hisoblaydi
+_PROCESS = psutil.Process()
+CPU_SAMPLE_INTERVAL = 5  # soniya
+_cpu_percent: float = 0.0
 
 
 async def _cleanup_loop():
@@ -106,25 +138,165 @@ async def _cleanup_loop():
             logger.error(f"Session cleanup error: {e}")
 
 
+async def _cpu_sampler_loop():
+    """
+    CPU foizini fonda o'lchash
+
+    cpu_percent(interval=None) bloklamaydi va oldingi chaqiruvdan beri
+    o'rtachani qaytaradi - handler event loop ni to'xtatmasdan oxirgi
+    qiymatni o'qiydi. Birinchi chaqiruv (0.0) faqat boshlang'ich nuqta.
+    """
+    global _cpu_percent
+    _PROCESS.cpu_percent(interval=None)
+    while True:
+        try:
+            await asyncio.sleep(CPU_SAMPLE_INTERVAL)
+            _cpu_percent = _PROCESS.cpu_percent(interval=None)
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error(f"CPU sampling error: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """G10 fix - Lifespan context manager for cleanup task"""
-    global _cleanup_task
+    """G10 fix - Lifespan context manager for background tasks"""
+    global _cleanup_task, _cpu_sampler_task
     # Startup
     _cleanup_task = asyncio.create_task(_cleanup_loop())
+    _cpu_sampler_task = asyncio.create_task(_cpu_sampler_loop())
     logger.info("Session cleanup task started")
 
     yield
 
     # Shutdown
-    if _cleanup_task:
-        _cleanup_task.cancel()
-        try:
-            await _cleanup_task
-        except asyncio.CancelledError:
-            pass
+    for task in (_cleanup_task, _cpu_sampler_task):
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
     logger.info("Session cleanup task stopped")
 
+    await close_shared_connectors()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#                               AUTHENTICATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# N1 fix - Development mode flag
+ALLOW_INSECURE = os.getenv("ALLOW_INSECURE", "false").lower() == "true"
+
+# Imzo tekshiriladigan yo'llar (HEMA -> bot user endpointlari)
+PROTECTED_PREFIX = "/api/v1/users"
+SIGNATURE_WINDOW_MS = 5 * 60 * 1000
+
+
+class HMACAuthMiddleware:
+    """
+    HEMA so'rovlarini tekshiruvchi pure-ASGI middleware
+
+    Headerlar scope["headers"] dan bitta o'tishda o'qiladi, body receive()
+    dan kelishi bilan HMAC ga beriladi. Imzo to'g'ri bo'lsa, yig'ilgan body
+    ilovaga qayta uzatiladi - handlerlar uni odatdagidek o'qiydi. Xato
+    bo'lsa, javob (HEMA formatida) to'g'ridan-to'g'ri send() orqali qaytadi.
+    """
+
+    def __init__(self, app, secret: bytes, allow_insecure: bool,
+                 protected_prefix: str = PROTECTED_PREFIX):
+        self.app = app
+        self.secret = secret
+        self.allow_insecure = allow_insecure
+        self.protected_prefix = protected_prefix
+        # Kalit bir marta tayyorlanadi (ipad/opad) - har so'rovda faqat copy()
+        self._mac = hmac.new(secret, digestmod=hashlib.sha256) if secret else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.protected_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        # N1 fix - BOT_SECRET majburiy (development mode dan tashqari)
+        if not self.secret:
+            if self.allow_insecure:
+                logger.warning("SECURITY WARNING: BOT_SECRET not configured, skipping verification!")
+                await self.app(scope, receive, send)
+            else:
+                await _send_error(
+                    send, 500, "INTERNAL_ERROR",
+                    "Server misconfigured: BOT_SECRET not set. Set ALLOW_INSECURE=true for development."
+                )
+            return
+
+        timestamp = signature = b""
+        for name, value in scope["headers"]:
+            if name == b"x-webhook-timestamp":
+                timestamp = value
+            elif name == b"x-webhook-signature":
+                signature = value
+
+        if not timestamp or not signature:
+            await _send_error(send, 401, "UNAUTHORIZED", "Missing authentication headers")
+            return
+
+        # Check timestamp (5 minute window)
+        try:
+            ts = int(timestamp)
+        except ValueError:
+            await _send_error(send, 401, "UNAUTHORIZED", "Invalid timestamp")
+            return
+        if abs(time.time() * 1000 - ts) > SIGNATURE_WINDOW_MS:
+            await _send_error(send, 401, "UNAUTHORIZED", "Request expired")
+            return
+
+        # Body ni o'qish bilan birga imzolash: "{timestamp}.{body}"
+        mac = self._mac.copy()
+        mac.update(timestamp + b".")
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                # Client uzildi - javob berishga hojat yo'q
+                return
+            chunk = message.get("body", b"")
+            if chunk:
+                mac.update(chunk)
+                chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+
+        if not hmac.compare_digest(mac.hexdigest().encode(), signature):
+            await _send_error(send, 401, "UNAUTHORIZED", "Invalid signature")
+            return
+
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay_receive():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
+
+
+async def _send_error(send, status: int, code: str, message: str):
+    """HEMA formatidagi xato javobini ASGI send orqali yuborish"""
+    payload = _json_dumps({"error": {"code": code, "message": message}})
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": payload})
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #                               FASTAPI APP
@@ -134,15 +306,29 @@ app = FastAPI(
     title=BOT_NAME,
     description="Grid Hedging Trading Robot for HEMA Platform",
     version=BOT_VERSION,
-    lifespan=lifespan  # G10 fix
+    lifespan=lifespan,  # G10 fix
+    default_response_class=DefaultResponse
 )
 
-# CORS
+# Auth - CORS ichida: preflight (OPTIONS) imzosiz javob oladi, 401 javoblar
+# ham CORS headerlari bilan qaytadi (oxirgi qo'shilgan middleware - tashqi)
+app.add_middleware(
+    HMACAuthMiddleware,
+    secret=BOT_SECRET.encode("utf-8"),
+    allow_insecure=ALLOW_INSECURE,
+)
+
+# GZip - /info (~5KB) va admin sessions kabi katta JSON javoblar uchun;
+# /health kabi kichik javoblar (<1KB) siqilmaydi
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# CORS - faqat brauzer so'rovlari uchun: Origin headeri yo'q so'rovlar
+# (HEMA server-to-server webhooklari) middleware dan darhol o'tadi
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
     allow_headers=["*"],
 )
 
@@ -151,9 +337,6 @@ app.add_middleware(
 #                               EXCEPTION HANDLERS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-from fastapi.responses import JSONResponse
-
-
 # Error code mapping for HEMA compatibility
 ERROR_CODE_MAP = {
     404: "USER_NOT_FOUND",
@@ -184,7 +367,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     elif "already running" in detail_str:
         error_code = "ALREADY_RUNNING"
 
-    return JSONResponse(
+    return DefaultResponse(
         status_code=exc.status_code,
         content={
             "error": {
@@ -196,346 +379,295 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
-#                               AUTHENTICATION
+#                               HEALTH & INFO ENDPOINTS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-# N1 fix - Development mode flag
-ALLOW_INSECURE = os.getenv("ALLOW_INSECURE", "false").lower() == "true"
-
-
-def verify_signature(timestamp: str, payload: str, signature: str, secret: str) -> bool:
-    """Verify HMAC signature"""
-    if not secret:
-        # N1 fix - secret majburiy
-        raise ValueError("Secret key is required for signature verification")
-
-    message = f"{timestamp}.{payload}"
-    expected = hmac.new(
-        secret.encode('utf-8'),
-        message.encode('utf-8'),
-        hashlib.sha256
-    ).hexdigest()
-
-    return hmac.compare_digest(expected, signature)
-
-
-async def verify_request(request: Request):
-    """Verify incoming request from HEMA"""
-    # N1 fix - BOT_SECRET majburiy (development mode dan tashqari)
-    if not BOT_SECRET:
-        if ALLOW_INSECURE:
-            logger.warning("SECURITY WARNING: BOT_SECRET not configured, skipping verification!")
-            return True
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail="Server misconfigured: BOT_SECRET not set. Set ALLOW_INSECURE=true for development."
-            )
-
-    timestamp = request.headers.get("X-Webhook-Timestamp", "")
-    signature = request.headers.get("X-Webhook-Signature", "")
-
-    if not timestamp or not signature:
-        raise HTTPException(status_code=401, detail="Missing authentication headers")
-
-    # Check timestamp (5 minute window)
-    try:
-        ts = int(timestamp)
-        if abs(time.time() * 1000 - ts) > 5 * 60 * 1000:
-            raise HTTPException(status_code=401, detail="Request expired")
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid timestamp")
-
-    body = await request.body()
-    if not verify_signature(timestamp, body.decode(), signature, BOT_SECRET):
-        raise HTTPException(status_code=401, detail="Invalid signature")
-
-    return True
-
+# Health javobining o'zgarmas qismi - har so'rovda faqat dinamik maydonlar qo'shiladi
+_HEALTH_STATIC = {
+    "status": "healthy",
+    "version": BOT_VERSION,
+}
 
-# ═══════════════════════════════════════════════════════════════════════════════
-#                               HEALTH & INFO ENDPOINTS
-# ═══════════════════════════════════════════════════════════════════════════════
 
 async def _health_response():
     """Health check response data"""
-    uptime = int((datetime.utcnow() - START_TIME).total_seconds())
     manager = get_session_manager()
 
-    return {
-        "status": "healthy",
-        "version": BOT_VERSION,
-        "uptime": uptime,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "activeSessions": manager.active_sessions,
-        "totalSessions": manager.total_sessions
-    }
+    return dict(
+        _HEALTH_STATIC,
+        uptime=int(time.monotonic() - _START_MONOTONIC),
+        timestamp=datetime.utcnow().isoformat() + "Z",
+        activeSessions=manager.active_sessions,
+        totalSessions=manager.total_sessions
+    )
 
 
-async def _info_response():
-    """Bot info response data - HEMA format"""
-    return {
-        "id": BOT_ID,
-        "name": BOT_NAME,
-        "version": BOT_VERSION,
-        "strategy": "GRID_HEDGING",
-        "description": "Grid Hedging strategiyasi asosida ishlaydigan trading robot. Martingale lot sizing va SMA/SAR/CCI entry signallari bilan.",
-        "author": "HEMA",
-        "exchange": "bitget",
-        "supportedPairs": [
-            "BTCUSDT", "ETHUSDT", "BNBUSDT", "XRPUSDT", "ADAUSDT",
-            "DOGEUSDT", "SOLUSDT", "DOTUSDT", "MATICUSDT", "LTCUSDT",
-            "AVAXUSDT", "LINKUSDT", "ATOMUSDT", "UNIUSDT", "APTUSDT"
-        ],
-        "supportedExchanges": ["bitget"],
-        "minTradeAmount": 10,
-        "maxTradeAmount": 10000,
-        "defaultSettings": {
-            "tradingPair": "BTCUSDT",
-            "leverage": 10,
-            "tradeAmount": 100,
-            "takeProfit": 3.0,
-            "stopLoss": 0,
-            "maxConcurrentTrades": 10
+# Bot info - HEMA format. Jarayon davomida o'zgarmaydi: bir marta quriladi va
+# tayyor JSON bytes sifatida qaytariladi (har so'rovda dict/encode yo'q)
+_INFO = {
+    "id": BOT_ID,
+    "name": BOT_NAME,
+    "version": BOT_VERSION,
+    "strategy": "GRID_HEDGING",
+    "description": "Grid Hedging strategiyasi asosida ishlaydigan trading robot. Martingale lot sizing va SMA/SAR/CCI entry signallari bilan.",
+    "author": "HEMA",
+    "exchange": "bitget",
+    "supportedPairs": [
+        "BTCUSDT", "ETHUSDT", "BNBUSDT", "XRPUSDT", "ADAUSDT",
+        "DOGEUSDT", "SOLUSDT", "DOTUSDT", "MATICUSDT", "LTCUSDT",
+        "AVAXUSDT", "LINKUSDT", "ATOMUSDT", "UNIUSDT", "APTUSDT"
+    ],
+    "supportedExchanges": ["bitget"],
+    "minTradeAmount": 10,
+    "maxTradeAmount": 10000,
+    "defaultSettings": {
+        "tradingPair": "BTCUSDT",
+        "leverage": 10,
+        "tradeAmount": 100,
+        "takeProfit": 3.0,
+        "stopLoss": 0,
+        "maxConcurrentTrades": 10
+    },
+    # HEMA-compatible configSchema format
+    # type: 'number' | 'string' | 'boolean' | 'select'
+    # label instead of name
+    "configSchema": {
+        # Grid Settings
+        "multiplier": {
+            "label": "Martingale Multiplier",
+            "type": "number",
+            "default": 1.5,
+            "min": 0,
+            "max": 5.0,
+            "step": 0.1,
+            "description": "Lot ko'paytirish koeffitsiyenti (0 = fixed lot)",
+            "group": "Grid Settings"
         },
-        # HEMA-compatible configSchema format
-        # type: 'number' | 'string' | 'boolean' | 'select'
-        # label instead of name
-        "configSchema": {
-            # Grid Settings
-            "multiplier": {
-                "label": "Martingale Multiplier",
-                "type": "number",
-                "default": 1.5,
-                "min": 0,
-                "max": 5.0,
-                "step": 0.1,
-                "description": "Lot ko'paytirish koeffitsiyenti (0 = fixed lot)",
-                "group": "Grid Settings"
-            },
-            "spacePercent": {
-                "label": "Grid Space %",
-                "type": "number",
-                "default": 0.5,
-                "min": 0.1,
-                "max": 10.0,
-                "step": 0.1,
-                "description": "Grid Level 1 masofa (foizda)",
-                "group": "Grid Settings"
-            },
-            "spaceOrders": {
-                "label": "Grid Level 1 Orders",
-                "type": "number",
-                "default": 5,
-                "min": 1,
-                "max": 50,
-                "step": 1,
-                "description": "Grid Level 1 dagi orderlar soni",
-                "group": "Grid Settings"
-            },
-            "space1Percent": {
-                "label": "Grid Level 2 %",
-                "type": "number",
-                "default": 1.5,
-                "min": 0.5,
-                "max": 20.0,
-                "step": 0.1,
-                "description": "Grid Level 2 masofa (foizda)",
-                "group": "Grid Settings"
-            },
-            "space2Percent": {
-                "label": "Grid Level 3 %",
-                "type": "number",
-                "default": 3.0,
-                "min": 1.0,
-                "max": 30.0,
-                "step": 0.5,
-                "description": "Grid Level 3 masofa (foizda)",
-                "group": "Grid Settings"
-            },
-            "space3Percent": {
-                "label": "Grid Level 4 %",
-                "type": "number",
-                "default": 5.0,
-                "min": 2.0,
-                "max": 50.0,
-                "step": 0.5,
-                "description": "Grid Level 4 masofa (foizda)",
-                "group": "Grid Settings"
-            },
-            # Entry Settings
-            "useSmaSar": {
-                "label": "Use SMA/SAR Entry",
-                "type": "boolean",
-                "default": True,
-                "description": "SMA/Parabolic SAR signallarini ishlatish",
-                "group": "Entry Settings"
-            },
-            "smaPeriod": {
-                "label": "SMA Period",
-                "type": "number",
-                "default": 7,
-                "min": 3,
-                "max": 100,
-                "step": 1,
-                "description": "SMA indikator davri",
-                "group": "Entry Settings"
-            },
-            "sarAf": {
-                "label": "SAR Acceleration",
-                "type": "number",
-                "default": 0.1,
-                "min": 0.01,
-                "max": 0.5,
-                "step": 0.01,
-                "description": "Parabolic SAR acceleration factor",
-                "group": "Entry Settings"
-            },
-            "sarMax": {
-                "label": "SAR Maximum",
-                "type": "number",
-                "default": 0.8,
-                "min": 0.1,
-                "max": 1.0,
-                "step": 0.1,
-                "description": "Parabolic SAR maksimal AF",
-                "group": "Entry Settings"
-            },
-            "cciPeriod": {
-                "label": "CCI Period",
-                "type": "number",
-                "default": 0,
-                "min": 0,
-                "max": 100,
-                "step": 1,
-                "description": "CCI indikator davri (0 = o'chirilgan)",
-                "group": "Entry Settings"
-            },
-            "cciMax": {
-                "label": "CCI Max Level",
-                "type": "number",
-                "default": 100,
-                "min": 50,
-                "max": 200,
-                "step": 10,
-                "description": "CCI yuqori signal darajasi",
-                "group": "Entry Settings"
-            },
-            "cciMin": {
-                "label": "CCI Min Level",
-                "type": "number",
-                "default": -100,
-                "min": -200,
-                "max": -50,
-                "step": 10,
-                "description": "CCI past signal darajasi",
-                "group": "Entry Settings"
-            },
-            "timeframe": {
-                "label": "Timeframe",
-                "type": "select",
-                "default": "1H",
-                "options": [
-                    {"value": "1m", "label": "1 Minute"},
-                    {"value": "5m", "label": "5 Minutes"},
-                    {"value": "15m", "label": "15 Minutes"},
-                    {"value": "30m", "label": "30 Minutes"},
-                    {"value": "1H", "label": "1 Hour"},
-                    {"value": "4H", "label": "4 Hours"},
-                    {"value": "1D", "label": "1 Day"}
-                ],
-                "description": "Signal timeframe",
-                "group": "Entry Settings"
-            },
-            "reverseOrder": {
-                "label": "Reverse Signals",
-                "type": "boolean",
-                "default": False,
-                "description": "Signal yo'nalishini teskari qilish",
-                "group": "Entry Settings"
-            },
-            # Profit Settings
-            "singleOrderProfit": {
-                "label": "Single Order Profit",
-                "type": "number",
-                "default": 3.0,
-                "min": 0.1,
-                "max": 1000,
-                "step": 0.5,
-                "description": "Bitta order uchun profit target (USDT)",
-                "group": "Profit Settings"
-            },
-            "pairGlobalProfit": {
-                "label": "Pair Global Profit",
-                "type": "number",
-                "default": 1.0,
-                "min": 0,
-                "max": 1000,
-                "step": 0.5,
-                "description": "Buy+Sell juftlik profit target (USDT)",
-                "group": "Profit Settings"
-            },
-            "globalProfit": {
-                "label": "Daily Profit Target",
-                "type": "number",
-                "default": 0,
-                "min": 0,
-                "max": 10000,
-                "step": 10,
-                "description": "Kunlik profit target (0 = cheksiz)",
-                "group": "Profit Settings"
-            },
-            "maxLoss": {
-                "label": "Max Loss",
-                "type": "number",
-                "default": 0,
-                "min": -10000,
-                "max": 0,
-                "step": 10,
-                "description": "Maksimal zarar chegarasi (0 = cheksiz)",
-                "group": "Profit Settings"
-            },
-            # Position Sizing
-            "baseLot": {
-                "label": "Base Lot Size",
-                "type": "number",
-                "default": 0.01,
-                "min": 0.001,
-                "max": 10.0,
-                "step": 0.001,
-                "description": "Boshlang'ich lot hajmi",
-                "group": "Position Sizing"
-            },
-            "leverage": {
-                "label": "Leverage",
-                "type": "number",
-                "default": 10,
-                "min": 1,
-                "max": 125,
-                "step": 1,
-                "description": "Trading leverage",
-                "group": "Position Sizing"
-            },
-            "tradesPerDay": {
-                "label": "Trades Per Day",
-                "type": "number",
-                "default": 99,
-                "min": 1,
-                "max": 999,
-                "step": 1,
-                "description": "Kunlik maksimal savdolar soni",
-                "group": "Risk Management"
-            }
+        "spacePercent": {
+            "label": "Grid Space %",
+            "type": "number",
+            "default": 0.5,
+            "min": 0.1,
+            "max": 10.0,
+            "step": 0.1,
+            "description": "Grid Level 1 masofa (foizda)",
+            "group": "Grid Settings"
         },
-        "capabilities": {
-            "spot": False,
-            "futures": True,
-            "margin": False
+        "spaceOrders": {
+            "label": "Grid Level 1 Orders",
+            "type": "number",
+            "default": 5,
+            "min": 1,
+            "max": 50,
+            "step": 1,
+            "description": "Grid Level 1 dagi orderlar soni",
+            "group": "Grid Settings"
         },
-        "riskWarning": "Bu robot grid hedging va martingale strategiyasini ishlatadi. Katta yo'qotishlarga olib kelishi mumkin. Ehtiyotkorlik bilan foydalaning.",
-        "minBalance": 100,
-        "recommendedBalance": 500
-    }
+        "space1Percent": {
+            "label": "Grid Level 2 %",
+            "type": "number",
+            "default": 1.5,
+            "min": 0.5,
+            "max": 20.0,
+            "step": 0.1,
+            "description": "Grid Level 2 masofa (foizda)",
+            "group": "Grid Settings"
+        },
+        "space2Percent": {
+            "label": "Grid Level 3 %",
+            "type": "number",
+            "default": 3.0,
+            "min": 1.0,
+            "max": 30.0,
+            "step": 0.5,
+            "description": "Grid Level 3 masofa (foizda)",
+            "group": "Grid Settings"
+        },
+        "space3Percent": {
+            "label": "Grid Level 4 %",
+            "type": "number",
+            "default": 5.0,
+            "min": 2.0,
+            "max": 50.0,
+            "step": 0.5,
+            "description": "Grid Level 4 masofa (foizda)",
+            "group": "Grid Settings"
+        },
+        # Entry Settings
+        "useSmaSar": {
+            "label": "Use SMA/SAR Entry",
+            "type": "boolean",
+            "default": True,
+            "description": "SMA/Parabolic SAR signallarini ishlatish",
+            "group": "Entry Settings"
+        },
+        "smaPeriod": {
+            "label": "SMA Period",
+            "type": "number",
+            "default": 7,
+            "min": 3,
+            "max": 100,
+            "step": 1,
+            "description": "SMA indikator davri",
+            "group": "Entry Settings"
+        },
+        "sarAf": {
+            "label": "SAR Acceleration",
+            "type": "number",
+            "default": 0.1,
+            "min": 0.01,
+            "max": 0.5,
+            "step": 0.01,
+            "description": "Parabolic SAR acceleration factor",
+            "group": "Entry Settings"
+        },
+        "sarMax": {
+            "label": "SAR Maximum",
+            "type": "number",
+            "default": 0.8,
+            "min": 0.1,
+            "max": 1.0,
+            "step": 0.1,
+            "description": "Parabolic SAR maksimal AF",
+            "group": "Entry Settings"
+        },
+        "cciPeriod": {
+            "label": "CCI Period",
+            "type": "number",
+            "default": 0,
+            "min": 0,
+            "max": 100,
+            "step": 1,
+            "description": "CCI indikator davri (0 = o'chirilgan)",
+            "group": "Entry Settings"
+        },
+        "cciMax": {
+            "label": "CCI Max Level",
+            "type": "number",
+            "default": 100,
+            "min": 50,
+            "max": 200,
+            "step": 10,
+            "description": "CCI yuqori signal darajasi",
+            "group": "Entry Settings"
+        },
+        "cciMin": {
+            "label": "CCI Min Level",
+            "type": "number",
+            "default": -100,
+            "min": -200,
+            "max": -50,
+            "step": 10,
+            "description": "CCI past signal darajasi",
+            "group": "Entry Settings"
+        },
+        "timeframe": {
+            "label": "Timeframe",
+            "type": "select",
+            "default": "1H",
+            "options": [
+                {"value": "1m", "label": "1 Minute"},
+                {"value": "5m", "label": "5 Minutes"},
+                {"value": "15m", "label": "15 Minutes"},
+                {"value": "30m", "label": "30 Minutes"},
+                {"value": "1H", "label": "1 Hour"},
+                {"value": "4H", "label": "4 Hours"},
+                {"value": "1D", "label": "1 Day"}
+            ],
+            "description": "Signal timeframe",
+            "group": "Entry Settings"
+        },
+        "reverseOrder": {
+            "label": "Reverse Signals",
+            "type": "boolean",
+            "default": False,
+            "description": "Signal yo'nalishini teskari qilish",
+            "group": "Entry Settings"
+        },
+        # Profit Settings
+        "singleOrderProfit": {
+            "label": "Single Order Profit",
+            "type": "number",
+            "default": 3.0,
+            "min": 0.1,
+            "max": 1000,
+            "step": 0.5,
+            "description": "Bitta order uchun profit target (USDT)",
+            "group": "Profit Settings"
+        },
+        "pairGlobalProfit": {
+            "label": "Pair Global Profit",
+            "type": "number",
+            "default": 1.0,
+            "min": 0,
+            "max": 1000,
+            "step": 0.5,
+            "description": "Buy+Sell juftlik profit target (USDT)",
+            "group": "Profit Settings"
+        },
+        "globalProfit": {
+            "label": "Daily Profit Target",
+            "type": "number",
+            "default": 0,
+            "min": 0,
+            "max": 10000,
+            "step": 10,
+            "description": "Kunlik profit target (0 = cheksiz)",
+            "group": "Profit Settings"
+        },
+        "maxLoss": {
+            "label": "Max Loss",
+            "type": "number",
+            "default": 0,
+            "min": -10000,
+            "max": 0,
+            "step": 10,
+            "description": "Maksimal zarar chegarasi (0 = cheksiz)",
+            "group": "Profit Settings"
+        },
+        # Position Sizing
+        "baseLot": {
+            "label": "Base Lot Size",
+            "type": "number",
+            "default": 0.01,
+            "min": 0.001,
+            "max": 10.0,
+            "step": 0.001,
+            "description": "Boshlang'ich lot hajmi",
+            "group": "Position Sizing"
+        },
+        "leverage": {
+            "label": "Leverage",
+            "type": "number",
+            "default": 10,
+            "min": 1,
+            "max": 125,
+            "step": 1,
+            "description": "Trading leverage",
+            "group": "Position Sizing"
+        },
+        "tradesPerDay": {
+            "label": "Trades Per Day",
+            "type": "number",
+            "default": 99,
+            "min": 1,
+            "max": 999,
+            "step": 1,
+            "description": "Kunlik maksimal savdolar soni",
+            "group": "Risk Management"
+        }
+    },
+    "capabilities": {
+        "spot": False,
+        "futures": True,
+        "margin": False
+    },
+    "riskWarning": "Bu robot grid hedging va martingale strategiyasini ishlatadi. Katta yo'qotishlarga olib kelishi mumkin. Ehtiyotkorlik bilan foydalaning.",
+    "minBalance": 100,
+    "recommendedBalance": 500
+}
+
+_INFO_JSON: bytes = _json_dumps(_INFO)
 
 
 # Root level endpoints
@@ -548,7 +680,7 @@ async def health_check():
 @app.get("/info")
 async def bot_info():
     """Bot information endpoint - root level"""
-    return await _info_response()
+    return Response(content=_INFO_JSON, media_type="application/json")
 
 
 # API versioned endpoints (for HEMA compatibility)
@@ -561,22 +693,62 @@ async def health_check_v1():
 @app.get("/api/v1/info")
 async def bot_info_v1():
     """Bot info endpoint - API v1 (called by HEMA when adding bot)"""
-    return await _info_response()
+    return Response(content=_INFO_JSON, media_type="application/json")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #                               USER ENDPOINTS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@app.post("/api/v1/users", response_model=SuccessResponse)
-async def register_user(request: Request, body: RegisterUserRequest):
+# SuccessResponse faqat OpenAPI hujjati uchun - handlerlar oddiy dict qaytaradi,
+# FastAPI uni pydantic orqali qayta validatsiya qilmaydi
+SUCCESS_RESPONSES = {200: {"model": SuccessResponse}}
+
+
+def _success(message: str, data: Optional[Dict[str, Any]] = None) -> Dict:
+    """SuccessResponse formatidagi javob"""
+    return {"success": True, "message": message, "data": data}
+
+
+# Status/settings so'rovlari uchun qisqa TTL cache (HEMA polling va
+# "Fetch from Server" burstlari) - (endpoint, user_id) -> (expires, JSON bytes)
+RESPONSE_CACHE_TTL = 1.5  # soniya
+RESPONSE_CACHE_MAX = 10_000
+_response_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def _cached_response(kind: str, user_id: str) -> Optional[Response]:
+    """Muddati o'tmagan cache javobi (yoki None)"""
+    entry = _response_cache.get((kind, user_id))
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return Response(content=entry[1], media_type="application/json")
+
+
+def _cache_response(kind: str, user_id: str, message: str, data: Dict) -> Response:
+    """SuccessResponse formatidagi javobni serializatsiya qilib cache ga yozish"""
+    body = _json_dumps(_success(message, data))
+    key = (kind, user_id)
+    _response_cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL, body)
+    _response_cache.move_to_end(key)
+    if len(_response_cache) > RESPONSE_CACHE_MAX:
+        _response_cache.popitem(last=False)
+    return Response(content=body, media_type="application/json")
+
+
+def _invalidate_user_cache(user_id: str):
+    """User holati o'zgarganda - keyingi so'rov yangi ma'lumot oladi"""
+    _response_cache.pop(("status", user_id), None)
+    _response_cache.pop(("settings", user_id), None)
+
+
+@app.post("/api/v1/users", responses=SUCCESS_RESPONSES)
+async def register_user(body: RegisterUserRequest):
     """
     Register a new user
 
     HEMA calls this when a user enables this bot
     """
-    await verify_request(request)
-
     manager = get_session_manager()
 
     try:
@@ -602,28 +774,28 @@ async def register_user(request: Request, body: RegisterUserRequest):
             webhook_secret=body.webhookSecret
         )
 
-        return SuccessResponse(
-            message="User registered successfully",
-            data=session.to_dict()
+        return _success(
+            "User registered successfully",
+            session.to_dict()
         )
 
     except Exception as e:
         logger.error(f"Failed to register user: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _invalidate_user_cache(body.userId)
 
 
-@app.post("/api/v1/users/{user_id}/start", response_model=SuccessResponse)
-async def start_trading(request: Request, user_id: str):
+@app.post("/api/v1/users/{user_id}/start", responses=SUCCESS_RESPONSES)
+async def start_trading(user_id: str):
     """Start trading for a user"""
-    await verify_request(request)
-
     manager = get_session_manager()
 
     try:
         session = await manager.start_trading(user_id)
-        return SuccessResponse(
-            message="Trading started",
-            data=session.to_dict()
+        return _success(
+            "Trading started",
+            session.to_dict()
         )
 
     except ValueError as e:
@@ -631,13 +803,13 @@ async def start_trading(request: Request, user_id: str):
     except Exception as e:
         logger.error(f"Failed to start trading: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _invalidate_user_cache(user_id)
 
 
-@app.post("/api/v1/users/{user_id}/close-positions", response_model=SuccessResponse)
-async def close_all_positions(request: Request, user_id: str):
+@app.post("/api/v1/users/{user_id}/close-positions", responses=SUCCESS_RESPONSES)
+async def close_all_positions(user_id: str):
     """Close all open positions for a user (without stopping the bot)"""
-    await verify_request(request)
-
     manager = get_session_manager()
     session = manager.get_session(user_id)
 
@@ -651,9 +823,9 @@ async def close_all_positions(request: Request, user_id: str):
         # Use the new method that sends proper webhooks
         await session.robot.close_all_positions_manually(reason="MANUAL_CLOSE")
 
-        return SuccessResponse(
-            message="All positions closed",
-            data={
+        return _success(
+            "All positions closed",
+            {
                 "buy_closed": len(session.robot.strategy.buy_positions) == 0,
                 "sell_closed": len(session.robot.strategy.sell_positions) == 0
             }
@@ -661,20 +833,20 @@ async def close_all_positions(request: Request, user_id: str):
     except Exception as e:
         logger.error(f"Failed to close positions for {user_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _invalidate_user_cache(user_id)
 
 
-@app.post("/api/v1/users/{user_id}/stop", response_model=SuccessResponse)
-async def stop_trading(request: Request, user_id: str):
+@app.post("/api/v1/users/{user_id}/stop", responses=SUCCESS_RESPONSES)
+async def stop_trading(user_id: str):
     """Stop trading for a user"""
-    await verify_request(request)
-
     manager = get_session_manager()
 
     try:
         session = await manager.stop_trading(user_id)
-        return SuccessResponse(
-            message="Trading stopped",
-            data=session.to_dict()
+        return _success(
+            "Trading stopped",
+            session.to_dict()
         )
 
     except ValueError as e:
@@ -682,21 +854,22 @@ async def stop_trading(request: Request, user_id: str):
     except Exception as e:
         logger.error(f"Failed to stop trading: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _invalidate_user_cache(user_id)
 
 
-@app.get("/api/v1/users/{user_id}/status", response_model=SuccessResponse)
-async def get_user_status(request: Request, user_id: str):
+@app.get("/api/v1/users/{user_id}/status", responses=SUCCESS_RESPONSES)
+async def get_user_status(user_id: str):
     """Get user trading status"""
-    await verify_request(request)
+    cached = _cached_response("status", user_id)
+    if cached is not None:
+        return cached
 
     manager = get_session_manager()
 
     try:
         status = await manager.get_status(user_id)
-        return SuccessResponse(
-            message="Status retrieved",
-            data=status
-        )
+        return _cache_response("status", user_id, "Status retrieved", status)
 
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -705,11 +878,9 @@ async def get_user_status(request: Request, user_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.delete("/api/v1/users/{user_id}", response_model=SuccessResponse)
-async def unregister_user(request: Request, user_id: str):
+@app.delete("/api/v1/users/{user_id}", responses=SUCCESS_RESPONSES)
+async def unregister_user(user_id: str):
     """Unregister a user"""
-    await verify_request(request)
-
     manager = get_session_manager()
 
     try:
@@ -717,23 +888,27 @@ async def unregister_user(request: Request, user_id: str):
         if not success:
             raise HTTPException(status_code=404, detail=f"User {user_id} not found")
 
-        return SuccessResponse(message="User unregistered")
+        return _success("User unregistered")
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to unregister user: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _invalidate_user_cache(user_id)
 
 
-@app.get("/api/v1/users/{user_id}/settings", response_model=SuccessResponse)
-async def get_user_settings(request: Request, user_id: str):
+@app.get("/api/v1/users/{user_id}/settings", responses=SUCCESS_RESPONSES)
+async def get_user_settings(user_id: str):
     """
     Get user's current trading settings
 
     HEMA "Fetch from Server" tugmasi uchun - user ning barcha sozlamalarini qaytaradi
     """
-    await verify_request(request)
+    cached = _cached_response("settings", user_id)
+    if cached is not None:
+        return cached
 
     manager = get_session_manager()
     session = manager.get_session(user_id)
@@ -801,10 +976,7 @@ async def get_user_settings(request: Request, user_id: str):
         }
     }
 
-    return SuccessResponse(
-        message="Settings retrieved",
-        data=settings_data
-    )
+    return _cache_response("settings", user_id, "Settings retrieved", settings_data)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -830,7 +1002,8 @@ async def verify_admin(x_admin_key: str = Header(None, alias="X-Admin-Key")):
             detail="X-Admin-Key header talab qilinadi"
         )
 
-    if not hmac.compare_digest(x_admin_key, ADMIN_API_KEY):
+    # bytes - non-ASCII header ham TypeError siz taqqoslanadi
+    if not hmac.compare_digest(x_admin_key.encode("utf-8"), _ADMIN_API_KEY_BYTES):
         raise HTTPException(
             status_code=401,
             detail="Noto'g'ri admin key"
@@ -846,11 +1019,11 @@ async def list_sessions(x_admin_key: str = Header(None, alias="X-Admin-Key")):
 
     manager = get_session_manager()
 
-    sessions = []
-    for session_key, session in manager._sessions.items():
-        session_data = session.to_dict()
-        session_data["session_key"] = session_key  # Session key ham qo'shish
-        sessions.append(session_data)
+    # Session key ham qo'shiladi
+    sessions = [
+        {**session.to_dict(), "session_key": session_key}
+        for session_key, session in manager._sessions.items()
+    ]
 
     return {
         "total": len(sessions),
@@ -865,13 +1038,16 @@ async def get_resources(x_admin_key: str = Header(None, alias="X-Admin-Key")):
     """Get resource usage"""
     await verify_admin(x_admin_key)
 
-    process = psutil.Process()
+    # oneshot - memory_info va num_threads bitta /proc o'qishidan
+    with _PROCESS.oneshot():
+        memory_info = _PROCESS.memory_info()
+        threads = _PROCESS.num_threads()
 
     return {
-        "cpu_percent": process.cpu_percent(),
-        "memory_mb": process.memory_info().rss / 1024 / 1024,
-        "threads": process.num_threads(),
-        "uptime": int((datetime.utcnow() - START_TIME).total_seconds())
+        "cpu_percent": _cpu_percent,
+        "memory_mb": memory_info.rss / 1024 / 1024,
+        "threads": threads,
+        "uptime": int(time.monotonic() - _START_MONOTONIC)
     }
 
 
@@ -917,6 +1093,8 @@ async def emergency_close_positions(
             status_code=500,
             detail=f"Pozitsiyalarni yopishda xato: {str(e)}"
         )
+    finally:
+        _invalidate_user_cache(user_id)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -183,7 +183,7 @@ class HedgingRobotWithWebhook(HedgingRobot):
 
             await self.webhook_client.send_status_update(
                 user_bot_id=self.user_bot_id,
-                symbol=self.config.trading.SYMBOL,
+                symbol=self._sym,
                 current_price=self.current_price,
                 sma_value=self.strategy.sma.value,
                 sar_value=self.strategy.sar.value,
@@ -208,7 +208,7 @@ class HedgingRobotWithWebhook(HedgingRobot):
             pos = self.strategy.buy_positions[-1]
             await self.webhook_client.send_trade_opened(
                 user_bot_id=self.user_bot_id,
-                symbol=self.config.trading.SYMBOL,
+                symbol=self._sym,
                 side="BUY",
                 price=pos.entry_price,
                 quantity=pos.lot,
@@ -224,7 +224,7 @@ class HedgingRobotWithWebhook(HedgingRobot):
             pos = self.strategy.sell_positions[-1]
             await self.webhook_client.send_trade_opened(
                 user_bot_id=self.user_bot_id,
-                symbol=self.config.trading.SYMBOL,
+                symbol=self._sym,
                 side="SELL",
                 price=pos.entry_price,
                 quantity=pos.lot,
@@ -253,13 +253,14 @@ class HedgingRobotWithWebhook(HedgingRobot):
             for p in self.strategy.buy_positions
         ]
         positions_before = len(self.strategy.buy_positions)
+        self._positions_dirty = True
 
         # Track if exchange close was successful
         exchange_close_success = False
         try:
             total_lots = self.strategy.get_total_buy_lots()
             await self.client.close_long(
-                symbol=self.config.trading.SYMBOL,
+                symbol=self._sym,
                 size=total_lots
             )
             exchange_close_success = True
@@ -267,7 +268,7 @@ class HedgingRobotWithWebhook(HedgingRobot):
             # Exchange muvaffaqiyatli yopdi - stats yangilash
             pnl, count = self.strategy.close_buy_positions(
                 self.current_price,
-                self.config.trading.LEVERAGE
+                self._lev
             )
             logger.info(f"Closed {count} BUY positions. PnL: ${pnl:.2f}")
 
@@ -298,7 +299,7 @@ class HedgingRobotWithWebhook(HedgingRobot):
                 individual_pnl = (exit_price - pos["entry_price"]) * pos["lot"]
                 await self.webhook_client.send_trade_closed(
                     user_bot_id=self.user_bot_id,
-                    symbol=self.config.trading.SYMBOL,
+                    symbol=self._sym,
                     side="BUY",
                     entry_price=pos["entry_price"],
                     exit_price=exit_price,
@@ -328,13 +329,14 @@ class HedgingRobotWithWebhook(HedgingRobot):
             for p in self.strategy.sell_positions
         ]
         positions_before = len(self.strategy.sell_positions)
+        self._positions_dirty = True
 
         # Track if exchange close was successful
         exchange_close_success = False
         try:
             total_lots = self.strategy.get_total_sell_lots()
             await self.client.close_short(
-                symbol=self.config.trading.SYMBOL,
+                symbol=self._sym,
                 size=total_lots
             )
             exchange_close_success = True
@@ -342,7 +344,7 @@ class HedgingRobotWithWebhook(HedgingRobot):
             # Exchange muvaffaqiyatli yopdi - stats yangilash
             pnl, count = self.strategy.close_sell_positions(
                 self.current_price,
-                self.config.trading.LEVERAGE
+                self._lev
             )
             logger.info(f"Closed {count} SELL positions. PnL: ${pnl:.2f}")
 
@@ -373,7 +375,7 @@ class HedgingRobotWithWebhook(HedgingRobot):
                 individual_pnl = (pos["entry_price"] - exit_price) * pos["lot"]
                 await self.webhook_client.send_trade_closed(
                     user_bot_id=self.user_bot_id,
-                    symbol=self.config.trading.SYMBOL,
+                    symbol=self._sym,
                     side="SELL",
                     entry_price=pos["entry_price"],
                     exit_price=exit_price,
@@ -398,7 +400,7 @@ class HedgingRobotWithWebhook(HedgingRobot):
             if local_buy_count == 0 and local_sell_count == 0:
                 logger.info("[MANUAL_CLOSE] Local positions empty, fetching from exchange...")
                 try:
-                    exchange_positions = await self.client.get_positions(self.config.trading.SYMBOL)
+                    exchange_positions = await self.client.get_positions(self._sym)
                     for pos in exchange_positions:
                         if pos.size > 0:
                             from .strategy import HedgingPosition
@@ -419,8 +421,10 @@ class HedgingRobotWithWebhook(HedgingRobot):
                 except Exception as e:
                     logger.error(f"[MANUAL_CLOSE] Failed to fetch positions from exchange: {e}")
 
-        await self._close_buy_positions(reason=reason)
-        await self._close_sell_positions(reason=reason)
+        await asyncio.gather(
+            self._close_buy_positions(reason=reason),
+            self._close_sell_positions(reason=reason)
+        )
         logger.info(f"[MANUAL_CLOSE] All positions closed for {self.user_bot_id}")
 
 
@@ -835,50 +839,55 @@ class SessionManager:
 
     def _create_robot_config(self, session: UserSession) -> RobotConfig:
         """UserSession dan RobotConfig yaratish"""
-        api = APIConfig()
-        api.API_KEY = session.api_key
-        api.SECRET_KEY = session.api_secret
-        api.PASSPHRASE = session.passphrase
-        api.DEMO_MODE = session.is_demo
-        api.__post_init__()
-
-        trading = TradingConfig()
-        trading.SYMBOL = session.trading_pair
-        trading.LEVERAGE = session.leverage
-
-        grid = GridConfig()
-        grid.MULTIPLIER = session.multiplier
-        grid.SPACE_PERCENT = session.space_percent
-        grid.SPACE_ORDERS = session.space_orders
-        grid.SPACE1_PERCENT = session.space1_percent
-        grid.SPACE1_ORDERS = session.space1_orders
-        grid.SPACE2_PERCENT = session.space2_percent
-        grid.SPACE2_ORDERS = session.space2_orders
-        grid.SPACE3_PERCENT = session.space3_percent
-        grid.SPACE3_ORDERS = session.space3_orders
-
-        entry = EntryConfig()
-        entry.USE_SMA_SAR = session.use_sma_sar
-        entry.SMA_PERIOD = session.sma_period
-        entry.SAR_AF = session.sar_af
-        entry.SAR_MAX = session.sar_max
-        entry.REVERSE_ORDER = session.reverse_order
-        entry.CCI_PERIOD = session.cci_period
-        entry.CCI_MAX = session.cci_max
-        entry.CCI_MIN = session.cci_min
-        entry.TIMEFRAME = session.timeframe
-
-        profit = ProfitConfig()
-        profit.SINGLE_ORDER_PROFIT = session.single_order_profit
-        profit.PAIR_GLOBAL_PROFIT = session.pair_global_profit
-        profit.GLOBAL_PROFIT = session.global_profit
-        profit.MAX_LOSS = session.max_loss
-        profit.TRADES_PER_DAY = session.trades_per_day
-
-        money = MoneyConfig()
-        money.BASE_LOT = session.base_lot
-        money.MIN_LOT = session.min_lot
-        money.MAX_LOT = session.max_lot
+        api = APIConfig(
+            API_KEY=session.api_key,
+            SECRET_KEY=session.api_secret,
+            PASSPHRASE=session.passphrase,
+            DEMO_MODE=session.is_demo
+        )
+
+        trading = TradingConfig(
+            SYMBOL=session.trading_pair,
+            LEVERAGE=session.leverage
+        )
+
+        grid = GridConfig(
+            MULTIPLIER=session.multiplier,
+            SPACE_PERCENT=session.space_percent,
+            SPACE_ORDERS=session.space_orders,
+            SPACE1_PERCENT=session.space1_percent,
+            SPACE1_ORDERS=session.space1_orders,
+            SPACE2_PERCENT=session.space2_percent,
+            SPACE2_ORDERS=session.space2_orders,
+            SPACE3_PERCENT=session.space3_percent,
+            SPACE3_ORDERS=session.space3_orders
+        )
+
+        entry = EntryConfig(
+            USE_SMA_SAR=session.use_sma_sar,
+            SMA_PERIOD=session.sma_period,
+            SAR_AF=session.sar_af,
+            SAR_MAX=session.sar_max,
+            REVERSE_ORDER=session.reverse_order,
+            CCI_PERIOD=session.cci_period,
+            CCI_MAX=session.cci_max,
+            CCI_MIN=session.cci_min,
+            TIMEFRAME=session.timeframe
+        )
+
+        profit = ProfitConfig(
+            SINGLE_ORDER_PROFIT=session.single_order_profit,
+            PAIR_GLOBAL_PROFIT=session.pair_global_profit,
+            GLOBAL_PROFIT=session.global_profit,
+            MAX_LOSS=session.max_loss,
+            TRADES_PER_DAY=session.trades_per_day
+        )
+
+        money = MoneyConfig(
+            BASE_LOT=session.base_lot,
+            MIN_LOT=session.min_lot,
+            MAX_LOT=session.max_lot
+        )
 
         return RobotConfig(
             api=api,
@@ -12,7 +12,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 from .config import RobotConfig, GridConfig, EntryConfig, ProfitConfig
-from .indicators import Candle, SMAIndicator, ParabolicSARIndicator, CCIIndicator
+from .indicators import Candles, SMAIndicator, ParabolicSARIndicator, CCIIndicator
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +24,8 @@ MAX_MARTINGALE_MULTIPLIER = 10.0  # Maksimal 10x
 #                               POSITION DATA
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
+# slots - __dict__ siz, har pozitsiya uchun kichikroq allocation
+@dataclass(slots=True)
 class HedgingPosition:
     """Grid pozitsiya ma'lumotlari"""
     id: str
@@ -107,31 +108,48 @@ class HedgingStrategy:
         # Trading state
         self._stop_trading: bool = False
         self._today_trades: int = 0
-        self._today_date: str = ""
+        self._today_day: int = -1  # UTC kun raqami (epoch // 86400)
 
     # ─────────────────────────────────────────────────────────────────────────
     #                           INDICATOR METHODS
     # ─────────────────────────────────────────────────────────────────────────
 
-    def update_indicators(self, candles: List[Candle]):
+    def update_indicators(self, candles: Candles):
         """
         Indikatorlarni yangilash
 
         Args:
-            candles: Candle ma'lumotlari
+            candles: Candle ro'yxati yoki CandleSeries
         """
         if len(candles) < 10:
             logger.warning("Not enough candles for indicators")
             return
 
-        # SMA va SAR
+        # SMA va SAR (SAR - faqat yopilgan shamlar, shakllanayotgani emas)
         self.sma.calculate(candles)
-        self.sar.calculate(candles)
+        self.sar.update_closed(candles)
 
         # CCI (agar yoqilgan bo'lsa)
         if self.cci:
             self.cci.calculate(candles)
 
+    def update_live(self, candles: Candles):
+        """
+        Shakllanayotgan sham uchun indikatorlarni yangilash (yangi sham yo'q tick)
+
+        SMA va CCI faqat oxirgi shamni almashtiradi (O(1)); SAR esa har
+        yopilgan sham uchun bir marta qadam tashlaydi - u update_indicators da.
+
+        Args:
+            candles: Candle ro'yxati yoki CandleSeries
+        """
+        if len(candles) < 10:
+            return
+
+        self.sma.calculate(candles)
+        if self.cci:
+            self.cci.calculate(candles)
+
     def check_entry_signals(self, is_new_bar: bool):
         """
         Entry signallarini tekshirish
@@ -694,9 +712,10 @@ class HedgingStrategy:
 
     def can_trade_today(self) -> bool:
         """Bugun savdo qilish mumkinmi?"""
-        today = datetime.utcnow().strftime("%Y-%m-%d")
-        if today != self._today_date:
-            self._today_date = today
+        # Kun almashganini butun son bilan aniqlash (datetime/strftime siz)
+        today = int(time.time() // 86400)
+        if today != self._today_day:
+            self._today_day = today
             self._today_trades = 0
 
         return self._today_trades < self.profit.TRADES_PER_DAY
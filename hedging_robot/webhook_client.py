@@ -19,6 +19,16 @@ import aiohttp
 
 logger = logging.getLogger(__name__)
 
+# JSON - orjson bo'lsa tezroq (bytes qaytaradi), bo'lmasa stdlib json
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode('utf-8')
+
 # M10 fix - Webhook queue limit
 MAX_QUEUE_SIZE = 1000
 
@@ -99,12 +109,12 @@ class WebhookClient:
 
         logger.info("Webhook client stopped")
 
-    def _generate_signature(self, timestamp: str, payload: str) -> str:
-        """HMAC-SHA256 signature yaratish"""
-        message = f"{timestamp}.{payload}"
+    def _generate_signature(self, timestamp: str, payload: bytes) -> str:
+        """HMAC-SHA256 signature yaratish (yuboriladigan body bytes ustidan)"""
+        message = timestamp.encode('utf-8') + b"." + payload
         return hmac.new(
             self.config.secret.encode('utf-8'),
-            message.encode('utf-8'),
+            message,
             hashlib.sha256
         ).hexdigest()
 
@@ -493,7 +503,7 @@ class WebhookClient:
 
     async def _send_with_retry(self, event: Dict[str, Any]) -> bool:
         """Retry bilan webhook yuborish"""
-        payload = json.dumps(event)
+        payload = _json_dumps(event)
         timestamp = str(int(time.time() * 1000))
         signature = self._generate_signature(timestamp, payload)
         webhook_id = f"{event['data']['userBotId']}-{timestamp}-{uuid.uuid4().hex[:8]}"
@@ -15,6 +15,7 @@ import sys
 import asyncio
 import argparse
 import logging
+from dataclasses import replace
 from pathlib import Path
 
 # Add parent directory to path
@@ -22,6 +23,13 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from hedging_robot.config import RobotConfig
 from hedging_robot.robot import HedgingRobot
+from hedging_robot.api_client import close_shared_connectors
+
+# uvloop (ixtiyoriy, Linux/macOS) - libuv asosidagi tezroq event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 
 def setup_logging(debug: bool = False):
@@ -74,44 +82,59 @@ def parse_args():
 
 
 def apply_args_to_config(config: RobotConfig, args):
-    """Apply CLI arguments to config"""
+    """Apply CLI arguments to config (sub-configlar frozen - replace orqali)"""
+    trading, api, grid, entry, profit, money = {}, {}, {}, {}, {}, {}
+
     if args.symbol:
-        config.trading.SYMBOL = args.symbol
+        trading["SYMBOL"] = args.symbol
 
     if args.leverage:
-        config.trading.LEVERAGE = args.leverage
+        trading["LEVERAGE"] = args.leverage
 
     if args.demo:
-        config.api.DEMO_MODE = True
+        api["DEMO_MODE"] = True
     elif args.real:
-        config.api.DEMO_MODE = False
+        api["DEMO_MODE"] = False
 
     if args.multiplier is not None:
-        config.grid.MULTIPLIER = args.multiplier
+        grid["MULTIPLIER"] = args.multiplier
 
     if args.space_percent is not None:
-        config.grid.SPACE_PERCENT = args.space_percent
+        grid["SPACE_PERCENT"] = args.space_percent
 
     if args.space_orders is not None:
-        config.grid.SPACE_ORDERS = args.space_orders
+        grid["SPACE_ORDERS"] = args.space_orders
 
     if args.timeframe:
-        config.entry.TIMEFRAME = args.timeframe
+        entry["TIMEFRAME"] = args.timeframe
 
     if args.no_sma_sar:
-        config.entry.USE_SMA_SAR = False
+        entry["USE_SMA_SAR"] = False
 
     if args.cci_period is not None:
-        config.entry.CCI_PERIOD = args.cci_period
+        entry["CCI_PERIOD"] = args.cci_period
 
     if args.single_profit is not None:
-        config.profit.SINGLE_ORDER_PROFIT = args.single_profit
+        profit["SINGLE_ORDER_PROFIT"] = args.single_profit
 
     if args.pair_profit is not None:
-        config.profit.PAIR_GLOBAL_PROFIT = args.pair_profit
+        profit["PAIR_GLOBAL_PROFIT"] = args.pair_profit
 
     if args.base_lot is not None:
-        config.money.BASE_LOT = args.base_lot
+        money["BASE_LOT"] = args.base_lot
+
+    if trading:
+        config.trading = replace(config.trading, **trading)
+    if api:
+        config.api = replace(config.api, **api)
+    if grid:
+        config.grid = replace(config.grid, **grid)
+    if entry:
+        config.entry = replace(config.entry, **entry)
+    if profit:
+        config.profit = replace(config.profit, **profit)
+    if money:
+        config.money = replace(config.money, **money)
 
     if args.debug:
         config.DEBUG = True
@@ -155,12 +178,16 @@ async def main():
         logger.error(f"Error: {e}", exc_info=True)
     finally:
         await robot.stop()
+        await close_shared_connectors()
 
     print("\n\nRobot stopped.")
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         pass
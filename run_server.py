@@ -96,12 +96,16 @@ def main():
     logger.info(f"Starting {bot_name} (ID: {bot_id})")
     logger.info(f"Listening on http://{args.host}:{args.port}")
 
-    # Run server
+    # Run server (loop="auto" - uvloop, http="auto" - httptools o'rnatilgan
+    # bo'lsa ular ishlatiladi, aks holda asyncio/h11).
+    # Bitta worker: sessiyalar jarayon xotirasida (SessionManager singleton)
     uvicorn.run(
         "hedging_robot.server:app",
         host=args.host,
         port=args.port,
         reload=args.reload,
+        loop="auto",
+        http="auto",
         log_level="debug" if args.debug else "info",
         access_log=args.debug
     )
@@ -0,0 +1,81 @@
+"""
+Indikator testlari
+"""
+
+import random
+
+import pytest
+
+from hedging_robot.indicators import CandleSeries, ParabolicSARIndicator
+
+BAR_MS = 60_000
+
+
+def _random_bars(seed: int, count: int):
+    """Tasodifiy yopilgan shamlar: (timestamp, open, high, low, close)"""
+    rng = random.Random(seed)
+    price = 100.0
+    bars = []
+    for i in range(count):
+        open_ = price
+        ticks = [open_]
+        for _ in range(20):
+            price *= 1 + rng.gauss(0, 0.002)
+            ticks.append(price)
+        bars.append((i * BAR_MS, open_, max(ticks), min(ticks), price))
+    return bars
+
+
+def _series(bars, forming=None) -> CandleSeries:
+    """Yopilgan shamlar + (ixtiyoriy) shakllanayotgan sham"""
+    series = CandleSeries()
+    for ts, o, h, l, c in bars:
+        series.append(ts, o, h, l, c)
+    if forming is not None:
+        ts, price = forming
+        series.append(ts, price, price, price, price)
+    return series
+
+
+def _bulk_closed(bars) -> ParabolicSARIndicator:
+    sar = ParabolicSARIndicator(0.02, 0.2)
+    sar.calculate_bulk(_series(bars))
+    return sar
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_sar_update_closed_matches_bulk_over_closed_bars(seed):
+    """Har yangi shamda qadam - yopilgan shamlar bo'yicha bulk bilan bir xil"""
+    bars = _random_bars(seed, 400)
+    window = 100
+    sar = ParabolicSARIndicator(0.02, 0.2)
+
+    for n in range(10, len(bars)):
+        closed = bars[max(0, n - window):n]
+        # Yangi sham endigina ochilgan - bitta tick (open = high = low)
+        sar.update_closed(_series(closed, forming=(n * BAR_MS, bars[n][1])))
+
+        expected = _bulk_closed(bars[:n])
+        assert sar.value == pytest.approx(expected.value)
+        assert sar._is_long == expected._is_long
+
+
+def test_sar_update_closed_catches_up_after_skipped_bars():
+    """Bir nechta sham o'tkazib yuborilsa - har biri uchun qadam"""
+    bars = _random_bars(7, 200)
+    sar = ParabolicSARIndicator(0.02, 0.2)
+
+    for n in (50, 53, 60, 61, 90):
+        sar.update_closed(_series(bars[:n], forming=(n * BAR_MS, bars[n][1])))
+        assert sar.value == pytest.approx(_bulk_closed(bars[:n]).value)
+
+
+def test_sar_update_closed_ignores_forming_bar():
+    """Shakllanayotgan sham narxi SAR ga ta'sir qilmaydi"""
+    bars = _random_bars(11, 60)
+    a = ParabolicSARIndicator(0.02, 0.2)
+    b = ParabolicSARIndicator(0.02, 0.2)
+
+    a.update_closed(_series(bars, forming=(60 * BAR_MS, 1.0)))
+    b.update_closed(_series(bars, forming=(60 * BAR_MS, 1000.0)))
+    assert a.value == b.value